@@ -23,10 +23,11 @@ router = APIRouter()
 )
 async def execute_sync_task(
     config_id: Annotated[int, Path(description="同步配置ID")],
-    db: CurrentSession
+    db: CurrentSession,
+    force_refresh: Annotated[bool, Query(description="是否忽略源列表缓存，强制重新获取")] = True
 ) -> ResponseSchemaModel[dict]:
     """执行同步任务"""
-    result = await file_sync_service.execute_sync_by_config_id(config_id, db)
+    result = await file_sync_service.execute_sync_by_config_id(config_id, db, force_refresh=force_refresh)
     
     # 确保 result 不为 None
     if not result:
@@ -297,13 +297,12 @@ class CRUDSyncTask(CRUDPlus[SyncTask]):
 
 
 class CRUDSyncTaskItem(CRUDPlus[SyncTaskItem]):
-    async def create(self, db: AsyncSession, *, obj_in: CreateSyncTaskItemParam) -> SyncTaskItem:
+    def _build_item(self, obj_in: CreateSyncTaskItemParam) -> SyncTaskItem:
         """
-        创建同步任务项
+        根据参数构建同步任务项对象（不写入数据库）
         
-        :param db: 数据库会话
         :param obj_in: 创建同步任务项参数
-        :return: 创建的同步任务项对象
+        :return: 同步任务项对象
         """
         dict_obj = obj_in.model_dump()
         
@@ -324,11 +323,35 @@ class CRUDSyncTaskItem(CRUDPlus[SyncTaskItem]):
             if key not in init_fields and hasattr(new_item, key):
                 setattr(new_item, key, value)
         
+        return new_item
+
+    async def create(self, db: AsyncSession, *, obj_in: CreateSyncTaskItemParam) -> SyncTaskItem:
+        """
+        创建同步任务项
+        
+        :param db: 数据库会话
+        :param obj_in: 创建同步任务项参数
+        :return: 创建的同步任务项对象
+        """
+        new_item = self._build_item(obj_in)
         db.add(new_item)
         await db.flush()
         await db.refresh(new_item)
         return new_item
 
+    async def bulk_create(self, db: AsyncSession, *, objs_in: list[CreateSyncTaskItemParam]) -> None:
+        """
+        批量创建同步任务项，所有记录在一次 flush 中写入
+        
+        :param db: 数据库会话
+        :param objs_in: 创建同步任务项参数列表
+        :return:
+        """
+        if not objs_in:
+            return
+        db.add_all([self._build_item(obj_in) for obj_in in objs_in])
+        await db.flush()
+
     async def get_items_by_task_id(
         self, 
         db: AsyncSession, 
@@ -28,6 +28,7 @@ from backend.app.coulddrive.schema.user import (
 
 from backend.app.coulddrive.service.alist.errors import AlistApiError
 from backend.app.coulddrive.service.filesync_service import ItemFilter
+from backend.app.coulddrive.service.utils_service import is_retryable_error
 from backend.app.coulddrive.service.yp_service import BaseDriveClient
 from backend.app.coulddrive.service.alist.schemas import (
     AlistFile,
@@ -364,6 +365,9 @@ class AlistClient(BaseDriveClient):
             
         except Exception as e:
             self.logger.error(f"删除文件失败: {e}")
+            # 限流和网络错误交给调用方重试，删除可以安全地重复执行
+            if is_retryable_error(e):
+                raise
             return False
 
     async def transfer(
@@ -404,6 +408,9 @@ class AlistClient(BaseDriveClient):
             
         except Exception as e:
             self.logger.error(f"转存文件失败: {e}")
+            # 限流和网络错误交给调用方处理（限流可重试；网络错误时请求可能已送达，不能重试）
+            if is_retryable_error(e):
+                raise
             return False
 
     async def get_share_list(
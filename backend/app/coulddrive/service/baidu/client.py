@@ -30,6 +30,7 @@ from backend.app.coulddrive.schema.user import (
 
 from backend.app.coulddrive.service.baidu.errors import BaiduApiError
 from backend.app.coulddrive.service.filesync_service import ItemFilter
+from backend.app.coulddrive.service.utils_service import is_retryable_error
 from backend.app.coulddrive.service.yp_service import BaseDriveClient
 from .schemas import (
     FromTo,
@@ -42,6 +43,8 @@ from backend.app.coulddrive.service.baidu.api import BaiduApi
 from backend.common.log import log
 
 SHARED_URL_PREFIX = "https://pan.baidu.com/s/"
+# /api/list 单页最多返回 1000 条，取上限以减少大目录的翻页请求次数
+DISK_LIST_PAGE_SIZE = 1000
 
 
 def _unify_shared_url(url: str) -> str:
@@ -300,7 +303,7 @@ class BaiduClient(BaseDriveClient):
                     
                     # 应用过滤器
                     if item_filter:
-                        cached_files = [item for item in cached_files if not item_filter.should_exclude(item)]
+                        cached_files = item_filter.filter_items(cached_files)
                     
                     return cached_files
                 else:
@@ -312,16 +315,18 @@ class BaiduClient(BaseDriveClient):
         drive_files_list: List[BaseFileInfo] = []
         initial_parent_id = file_id
 
-        async def fetch_all_pages_from_api(target_file_path: str, **api_params) -> List[Dict]:
+        async def fetch_all_pages_from_api(
+            target_file_path: str, page_size: int = DISK_LIST_PAGE_SIZE, **api_params
+        ) -> List[Dict]:
             """
             自动翻页获取指定路径下的所有文件/目录
             
             :param target_file_path: 目标路径
+            :param page_size: 每页数量，默认取接口上限
             :param api_params: API参数（如desc、name、time、size）
             :return: 所有页面的文件列表
             """
             page = 1
-            page_size = 100
             all_items = []
             
             while True:
@@ -662,7 +667,7 @@ class BaiduClient(BaseDriveClient):
             # 捕获其他未预料的错误
             self.logger.error(f"删除文件/目录时发生未知错误: {str(e_generic)}")
             # 将未知错误包装成 BaiduApiError 再抛出
-            raise BaiduApiError(f"删除文件/目录失败 (未知错误): {str(e_generic)}")
+            raise BaiduApiError(f"删除文件/目录失败 (未知错误): {str(e_generic)}", cause=e_generic)
 
     def share(self, *file_paths: str, password: str, period: int = 0) -> PcsSharedLink:
         """将`file_paths`公开分享，可选择使用密码
@@ -1645,6 +1650,9 @@ class BaiduClient(BaseDriveClient):
                     return False
             except BaiduApiError as e:
                 self.logger.error(f"'{source_type}' 转存期间发生百度 API 错误: {e}")
+                # 限流和网络错误交给调用方处理（限流可重试；网络错误时请求可能已送达，不能重试）
+                if is_retryable_error(e):
+                    raise
                 return False
             except Exception as e:
                 self.logger.error(f"'{source_type}' 转存期间发生意外错误: {e}")
@@ -2,16 +2,24 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
+import asyncio
+import dataclasses
+import fnmatch
+import hashlib
 import json
 import logging
-import os
+import posixpath
 import re
+import threading
 import time
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 from datetime import datetime
-from pathlib import PurePosixPath
-from typing import Any, Dict, List, Optional, Pattern, Set, Tuple, Union
+from functools import lru_cache
+from operator import attrgetter, itemgetter
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Pattern, Set, Tuple, Union
 
+import msgspec
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.app.coulddrive.model.filesync import SyncConfig, SyncTask, SyncTaskItem
@@ -40,6 +48,7 @@ from backend.app.coulddrive.schema.filesync import (
     GetSyncTaskItemDetail
 )
 from backend.app.coulddrive.schema.user import GetDriveAccountDetail
+from backend.app.coulddrive.service.utils_service import call_with_retry
 from backend.app.coulddrive.service.yp_service import get_drive_manager
 from backend.app.coulddrive.crud.crud_filesync import sync_task_dao, sync_task_item_dao, sync_config_dao
 from backend.app.coulddrive.crud.crud_drive_account import drive_account_dao
@@ -48,6 +57,66 @@ from backend.database.db import async_db_session
 
 logger = logging.getLogger(__name__)
 
+# 同步方式字符串到标准值的映射
+_METHOD_MAP = {
+    "incremental": SyncMethod.INCREMENTAL.value,
+    "full": SyncMethod.FULL.value,
+    "overwrite": SyncMethod.OVERWRITE.value,
+}
+
+# 数据库中的网盘类型可能保存为枚举名或枚举值
+_DRIVE_TYPE_BY_NAME = {drive_type.name: drive_type for drive_type in DriveType}
+_DRIVE_TYPE_BY_VALUE = {drive_type.value: drive_type for drive_type in DriveType}
+
+# 删除操作的单批最大项目数
+_DELETE_CHUNK_SIZE = 500
+
+# 比较用源列表缓存：调用方明确允许时（force_refresh=False），同一配置短时间内重复同步可复用上次获取的分享列表；
+# 值为 (获取时间, 客户端, 获取前的写操作计数, 列表)，客户端被替换或发生写操作后不再命中。
+# 不同线程中的事件循环（如 celery 任务）共用该缓存，读写都在锁内进行
+_LISTING_CACHE_TTL = 300.0
+_LISTING_CACHE_MAX_ENTRIES = 512
+_listing_cache: "OrderedDict[Tuple[Any, ...], Tuple[float, Any, int, List[BaseFileInfo]]]" = OrderedDict()
+_listing_cache_lock = threading.Lock()
+
+# 转存分组时批量取出源文件及其ID
+_get_source_item = itemgetter("source_item")
+_get_file_id = attrgetter("file_id")
+
+
+
+@dataclasses.dataclass(slots=True)
+class OperationRecord:
+    """单个文件操作的结果记录，仅在输出时才渲染为描述字符串"""
+
+    status: str
+    src_path: str
+    dst_path: Optional[str] = None
+    file_id: Optional[str] = None
+    detail: Optional[str] = None
+
+    def __str__(self) -> str:
+        if self.dst_path is not None:
+            text = f"{self.status}: {self.src_path} -> {self.dst_path}"
+        else:
+            text = f"{self.status}: {self.src_path} (ID: {self.file_id})"
+        return f"{text} - {self.detail}" if self.detail is not None else text
+
+
+def _render_operation_results(
+    operation_results: Dict[str, Dict[str, List[OperationRecord]]]
+) -> Dict[str, Dict[str, List[str]]]:
+    """
+    将操作结果记录渲染为描述字符串，用于接口返回
+
+    :param operation_results: apply_comparison_operations 返回的操作结果
+    :return: 结构相同、记录替换为描述字符串的结果
+    """
+    return {
+        op_type: {status: [str(record) for record in records] for status, records in results.items()}
+        for op_type, results in operation_results.items()
+    }
+
 class FileSyncService:
     """文件同步服务"""
     
@@ -56,28 +125,41 @@ class FileSyncService:
         # 移除重复的客户端缓存，直接使用全局管理器
         pass
     
-    def _parse_sync_method(self, method_str: str) -> str:
+    def _parse_sync_method(self, method: Union[SyncMethod, str]) -> str:
         """解析同步方式
         
         Args:
-            method_str: 同步方式字符串
+            method: 同步方式枚举或字符串
             
         Returns:
             str: 标准化的同步方式
         """
+        if isinstance(method, SyncMethod):
+            return method.value
+
         # 尝试匹配枚举值
-        method_lower = method_str.lower() if method_str else ""
-        
-        if method_lower == SyncMethod.INCREMENTAL.value:
-            return SyncMethod.INCREMENTAL.value
-        elif method_lower == SyncMethod.FULL.value:
-            return SyncMethod.FULL.value
-        elif method_lower == SyncMethod.OVERWRITE.value:
-            return SyncMethod.OVERWRITE.value
-        else:
+        method_lower = str(method).lower() if method else ""
+        sync_method = _METHOD_MAP.get(method_lower)
+        if sync_method is None:
             # 默认使用增量同步
-            logger.warning(f"未知的同步方式: {method_str}，使用默认增量同步")
+            logger.warning("未知的同步方式: %s，使用默认增量同步", method)
             return SyncMethod.INCREMENTAL.value
+        return sync_method
+
+    def _fail(self, error_msg: str, start_time: float) -> Dict[str, Any]:
+        """
+        记录错误并构建同步失败的返回结果
+        
+        :param error_msg: 错误信息
+        :param start_time: 同步开始时间戳
+        :return: 失败结果字典
+        """
+        logger.error(error_msg)
+        return {
+            "success": False,
+            "error": error_msg,
+            "elapsed_time": time.time() - start_time
+        }
 
     def _parse_recursion_speed(self, speed_value: int) -> RecursionSpeed:
         """解析递归速度
@@ -96,12 +178,15 @@ class FileSyncService:
             # 默认使用正常速度
             return RecursionSpeed.NORMAL
 
-    async def perform_sync(self, sync_config: GetSyncConfigDetail, db: AsyncSession = None) -> Dict[str, Any]:
+    async def perform_sync(
+        self, sync_config: GetSyncConfigDetail, db: AsyncSession = None, force_refresh: bool = True
+    ) -> Dict[str, Any]:
         """执行同步任务
         
         Args:
             sync_config: 同步配置
             db: 数据库会话
+            force_refresh: 是否忽略源列表缓存，强制重新获取（默认忽略；目标列表始终重新获取）
             
         Returns:
             Dict[str, Any]: 同步结果
@@ -131,64 +216,32 @@ class FileSyncService:
             
         if not account_schema:
             error_msg = f"未找到ID为{sync_config.user_id}的账号，无法执行同步任务"
-            logger.error(error_msg)
-            return {
-                "success": False,
-                "error": error_msg,
-                "elapsed_time": time.time() - start_time
-            }
+            return self._fail(error_msg, start_time)
         
                     # logger.info(f"成功获取到账号: {account_schema.username or account_schema.user_id} (ID: {account_schema.id})")
         
         # 验证账号和配置关系
         if sync_config.user_id != account_schema.id:
             error_msg = f"严重的内部错误: 同步配置 {sync_config.id} 的账号ID({sync_config.user_id})与获取到的账号ID({account_schema.id})不匹配"
-            logger.error(error_msg)
-            return {
-                "success": False,
-                "error": error_msg,
-                "elapsed_time": time.time() - start_time
-            }
+            return self._fail(error_msg, start_time)
         
         # 验证账号参数
         if not hasattr(account_schema, "cookies") or not account_schema.cookies:
             error_msg = f"账号 {account_schema.id} 缺少cookies字段，无法执行同步"
-            logger.error(error_msg)
-            return {
-                "success": False,
-                "error": error_msg,
-                "elapsed_time": time.time() - start_time
-            }
+            return self._fail(error_msg, start_time)
         
         # 验证账号类型
         if not hasattr(account_schema, "type") or not account_schema.type:
             error_msg = f"账号 {account_schema.id} 缺少type字段，无法确定网盘类型"
-            logger.error(error_msg)
-            return {
-                "success": False,
-                "error": error_msg,
-                "elapsed_time": time.time() - start_time
-            }
+            return self._fail(error_msg, start_time)
         
         # 获取全局网盘管理器
         drive_manager = get_drive_manager()
         
         try:
-            # 解析源信息
-            src_meta = {}
-            if sync_config.src_meta:
-                try:
-                    src_meta = json.loads(sync_config.src_meta)
-                except json.JSONDecodeError:
-                    logger.warning(f"解析源元数据失败: {sync_config.src_meta}")
-            
-            # 解析目标信息
-            dst_meta = {}
-            if sync_config.dst_meta:
-                try:
-                    dst_meta = json.loads(sync_config.dst_meta)
-                except json.JSONDecodeError:
-                    logger.warning(f"解析目标元数据失败: {sync_config.dst_meta}")
+            # 解析源信息和目标信息
+            src_meta = _decode_meta(sync_config.src_meta, "源元数据")
+            dst_meta = _decode_meta(sync_config.dst_meta, "目标元数据")
             
             # 解析规则模板
             exclude_rules, rename_rules = await self._parse_rule_templates(
@@ -198,7 +251,7 @@ class FileSyncService:
             )
             
             # 解析同步方式和递归速度
-            sync_method = self._parse_sync_method(sync_config.method.value if hasattr(sync_config.method, 'value') else str(sync_config.method))
+            sync_method = self._parse_sync_method(sync_config.method)
             recursion_speed = self._parse_recursion_speed(sync_config.speed)
             
             # 构建源定义
@@ -206,7 +259,7 @@ class FileSyncService:
                 source_type=src_meta.get("source_type", "friend"),
                 source_id=src_meta.get("source_id", ""),
                 file_path=sync_config.src_path,
-                ext_params=src_meta.get("ext_params", {})
+                ext_params=_ensure_dict(src_meta.get("ext_params"))
             )
             
             # 构建目标定义
@@ -233,7 +286,8 @@ class FileSyncService:
                 comparison_mode=sync_method,
                 exclude_rules_def=exclude_rules,
                 rename_rules_def=rename_rules,
-                drive_type_str=drive_type_str
+                drive_type_str=drive_type_str,
+                force_refresh=force_refresh
             )
             
             # 应用比较结果
@@ -270,39 +324,31 @@ class FileSyncService:
                 )
                 await sync_task_dao.update(db, db_obj=sync_task, obj_in=task_update)
                 
-                # 创建任务项记录
+                # 创建任务项记录（收集后一次性写入，避免逐条 flush）；
+                # 记录所在的列表决定成败，failed 列表中的跳过等记录同样保存原因
+                item_params: List[CreateSyncTaskItemParam] = []
                 for result_type, results in operation_results.items():
-                    for status, items in results.items():
-                        for item_desc in items:
-                            # 解析操作描述
-                            parts = item_desc.split(": ")
-                            if len(parts) >= 2:
-                                operation_info = parts[1]
-                                if " -> " in operation_info:
-                                    src_path, dst_path = operation_info.split(" -> ", 1)
-                                else:
-                                    src_path = operation_info
-                                    dst_path = operation_info
-                                
-                                file_name = src_path.split("/")[-1] if "/" in src_path else src_path
-                                
-                                item_param = CreateSyncTaskItemParam(
-                                    task_id=sync_task.id,
-                                    type=result_type,
-                                    src_path=src_path,
-                                    dst_path=dst_path,
-                                    file_name=file_name,
-                                    status="completed" if "SUCCESS" in item_desc else "failed",
-                                    err_msg=item_desc if "ERROR" in item_desc or "FAIL" in item_desc else None
-                                )
-                                await sync_task_item_dao.create(db, obj_in=item_param)
+                    for result_status, records in results.items():
+                        is_failed = result_status == "failed"
+                        for record in records:
+                            src_path = record.src_path
+                            item_params.append(CreateSyncTaskItemParam(
+                                task_id=sync_task.id,
+                                type=result_type,
+                                src_path=src_path,
+                                dst_path=record.dst_path if record.dst_path is not None else src_path,
+                                file_name=src_path.rsplit("/", 1)[-1],
+                                status="failed" if is_failed else "completed",
+                                err_msg=str(record) if is_failed else None
+                            ))
                 
+                await sync_task_item_dao.bulk_create(db, objs_in=item_params)
                 await db.commit()
             
             return {
                 "success": True,
                 "stats": stats,
-                "details": operation_results,
+                "details": _render_operation_results(operation_results),
                 "elapsed_time": elapsed_time,
                 "task_id": sync_task.id if sync_task else None
             }
@@ -325,8 +371,10 @@ class FileSyncService:
                 "task_id": sync_task.id if sync_task else None
             }
 
-    async def execute_sync_by_config_id(self, config_id: int, db: AsyncSession) -> Dict[str, Any]:
-        """根据配置ID执行同步任务"""
+    async def execute_sync_by_config_id(
+        self, config_id: int, db: AsyncSession, force_refresh: bool = True
+    ) -> Dict[str, Any]:
+        """根据配置ID执行同步任务，force_refresh 为 False 时允许复用源列表缓存"""
         # 使用 CRUD 层的验证方法
         sync_config, error_msg = await sync_config_dao.get_with_validation(db, config_id)
         if not sync_config:
@@ -335,17 +383,6 @@ class FileSyncService:
         if error_msg:  # 配置存在但被禁用
             return {"success": False, "error": error_msg}
         
-        # 内联转换数据库模型到详情 Schema
-        def get_drive_type_from_db_value(db_value: str) -> DriveType:
-            """从数据库值获取 DriveType 枚举"""
-            try:
-                return DriveType[db_value]
-            except KeyError:
-                for drive_type in DriveType:
-                    if drive_type.value == db_value:
-                        return drive_type
-                raise ValueError(f"无效的网盘类型: {db_value}，支持的类型: {[dt.value for dt in DriveType]}")
-        
         # 使用字典方式创建 schema 对象，确保 field_validator 生效
         try:
             # 将 SQLAlchemy 对象转换为字典，触发 field_validator
@@ -378,7 +415,7 @@ class FileSyncService:
                 id=sync_config.id,
                 enable=sync_config.enable,
                 remark=sync_config.remark,
-                type=get_drive_type_from_db_value(sync_config.type),
+                type=_drive_type_from_db_value(sync_config.type),
                 src_path=sync_config.src_path,
                 src_meta=sync_config.src_meta,
                 dst_path=sync_config.dst_path,
@@ -416,14 +453,14 @@ class FileSyncService:
             await db.refresh(sync_config)
             # logger.info(f"配置 {sync_config.id} 开始执行同步任务，last_sync已更新为: {execution_start_time}")
         except Exception as update_error:
-            logger.error(f"配置 {sync_config.id} 更新last_sync时发生错误: {str(update_error)}")
+            logger.error("配置 %s 更新last_sync时发生错误: %s", sync_config.id, update_error)
             return {
                 "success": False,
                 "error": f"更新last_sync失败: {str(update_error)}"
             }
         
         # 执行同步任务
-        sync_result = await self.perform_sync(sync_config_detail, db)
+        sync_result = await self.perform_sync(sync_config_detail, db, force_refresh=force_refresh)
             
         return sync_result
 
@@ -462,13 +499,13 @@ class FileSyncService:
                             exclude_rules.append(exclude_rule)
                     else:
                         if not is_active:
-                            logger.warning(f"排除规则模板 {exclude_template_id} 已禁用")
+                            logger.warning("排除规则模板 %s 已禁用", exclude_template_id)
                         else:
-                            logger.warning(f"排除规则模板 {exclude_template_id} 配置格式不正确")
+                            logger.warning("排除规则模板 %s 配置格式不正确", exclude_template_id)
                 else:
-                    logger.warning(f"排除规则模板 {exclude_template_id} 不存在")
+                    logger.warning("排除规则模板 %s 不存在", exclude_template_id)
             except Exception as e:
-                logger.error(f"解析排除规则模板 {exclude_template_id} 失败: {e}")
+                logger.error("解析排除规则模板 %s 失败: %s", exclude_template_id, e)
         
         # 解析重命名规则模板
         if rename_template_id:
@@ -486,13 +523,13 @@ class FileSyncService:
                             rename_rules.append(rename_rule)
                     else:
                         if not is_active:
-                            logger.warning(f"重命名规则模板 {rename_template_id} 已禁用")
+                            logger.warning("重命名规则模板 %s 已禁用", rename_template_id)
                         else:
-                            logger.warning(f"重命名规则模板 {rename_template_id} 配置格式不正确")
+                            logger.warning("重命名规则模板 %s 配置格式不正确", rename_template_id)
                 else:
-                    logger.warning(f"重命名规则模板 {rename_template_id} 不存在")
+                    logger.warning("重命名规则模板 %s 不存在", rename_template_id)
             except Exception as e:
-                logger.error(f"解析重命名规则模板 {rename_template_id} 失败: {e}")
+                logger.error("解析重命名规则模板 %s 失败: %s", rename_template_id, e)
         
         return exclude_rules, rename_rules
 
@@ -598,7 +635,52 @@ class FileSyncService:
 # 创建服务单例
 file_sync_service = FileSyncService()
 
+def _drive_type_from_db_value(db_value: str) -> DriveType:
+    """从数据库值（枚举名或枚举值）获取 DriveType 枚举"""
+    drive_type = _DRIVE_TYPE_BY_NAME.get(db_value) or _DRIVE_TYPE_BY_VALUE.get(db_value)
+    if drive_type is None:
+        raise ValueError(f"无效的网盘类型: {db_value}，支持的类型: {list(_DRIVE_TYPE_BY_VALUE)}")
+    return drive_type
+
+def _ensure_dict(value: Any) -> Dict[str, Any]:
+    """将可能为 None 或非字典的扩展参数（历史数据）规整为字典"""
+    return value if isinstance(value, dict) else {}
+
+def _decode_meta(raw: Optional[str], label: str) -> Dict[str, Any]:
+    """解析同步配置中的 JSON 元数据，空白内容直接返回空字典，解析失败时记录警告"""
+    if not raw or raw.isspace():
+        return {}
+    try:
+        return _ensure_dict(msgspec.json.decode(raw))
+    except msgspec.DecodeError:
+        logger.warning("解析%s失败: %s", label, raw)
+        return {}
+
+@lru_cache(maxsize=1024)
+def _compile_rule_regex(pattern: str, case_sensitive: bool) -> Pattern:
+    """编译规则使用的正则表达式，相同模式在多次同步之间复用已编译对象"""
+    return re.compile(pattern, 0 if case_sensitive else re.IGNORECASE)
+
+def _get_match_value(item: BaseFileInfo, target: MatchTarget, case_sensitive: bool) -> Optional[str]:
+    value: Optional[str] = None
+    if target == MatchTarget.NAME:
+        value = item.file_name
+    elif target == MatchTarget.PATH:
+        value = item.file_path
+    elif target == MatchTarget.EXTENSION:
+        file_name = item.file_name
+        dot_index = file_name.rfind('.')
+        if item.is_folder or dot_index < 0: # Folders or files without extension
+            return None # Cannot match extension
+        value = file_name[dot_index + 1:]
+
+    if value is not None and not case_sensitive:
+        return value.lower()
+    return value
+
 class ExclusionRule:
+    __slots__ = ("pattern_str", "target", "item_type", "mode", "case_sensitive", "_compiled_regex")
+
     def __init__(self,
                  pattern: str,
                  target: MatchTarget = MatchTarget.NAME,
@@ -617,30 +699,18 @@ class ExclusionRule:
         self._compiled_regex: Optional[Pattern] = None
         if self.mode == MatchMode.REGEX:
             try:
-                self._compiled_regex = re.compile(self.pattern_str, 0 if self.case_sensitive else re.IGNORECASE)
+                self._compiled_regex = _compile_rule_regex(self.pattern_str, self.case_sensitive)
             except re.error as e:
                 raise ValueError(f"Invalid regex pattern '{self.pattern_str}': {e}")
         elif self.mode == MatchMode.WILDCARD:
-            # Convert wildcard to regex
-            # Basic conversion: escape regex chars, then replace * with .* and ? with .
-            regex_pattern = re.escape(self.pattern_str).replace(r'\*', '.*').replace(r'\?', '.')
-            self._compiled_regex = re.compile(regex_pattern, 0 if self.case_sensitive else re.IGNORECASE)
+            # Convert wildcard to regex with the stdlib translator, which also understands [...] classes.
+            # fnmatch anchors the result at the end; drop that anchor so the rule keeps its
+            # substring-search semantics (e.g. "*.log" still excludes "app.log.bak").
+            regex_pattern = fnmatch.translate(self.pattern_str).removesuffix(r'\Z').removesuffix(r'\z')
+            self._compiled_regex = _compile_rule_regex(regex_pattern, self.case_sensitive)
 
     def _get_value_to_match(self, item: BaseFileInfo) -> Optional[str]:
-        value: Optional[str] = None
-        if self.target == MatchTarget.NAME:
-            value = item.file_name
-        elif self.target == MatchTarget.PATH:
-            value = item.file_path
-        elif self.target == MatchTarget.EXTENSION:
-            if not item.is_folder and '.' in item.file_name:
-                value = item.file_name.rsplit('.', 1)[-1]
-            else: # Folders or files without extension
-                return None # Cannot match extension
-
-        if value is not None and not self.case_sensitive:
-            return value.lower()
-        return value
+        return _get_match_value(item, self.target, self.case_sensitive)
 
     def matches(self, item: BaseFileInfo) -> bool:
         # 1. Check item type
@@ -670,22 +740,117 @@ class ExclusionRule:
         
         return match_result
 
+class _RuleBucket:
+    """
+    Exclusion rules sharing the same (target, case_sensitive) and applicable to the same kind of item,
+    fused so that an item's match value is computed once and checked with one set lookup and one
+    regex search instead of one call per rule.
+    """
+
+    __slots__ = ("target", "case_sensitive", "exact_values", "fallback_rules", "pattern")
+
+    def __init__(self, target: MatchTarget, case_sensitive: bool, rules: List[ExclusionRule]):
+        self.target = target
+        self.case_sensitive = case_sensitive
+        self.exact_values = frozenset(rule.pattern_str for rule in rules if rule.mode == MatchMode.EXACT)
+        self.fallback_rules: List[ExclusionRule] = []
+        self.pattern: Optional[Pattern] = None
+
+        alternatives = []
+        for rule in rules:
+            if rule.mode == MatchMode.EXACT:
+                continue
+            if rule.mode == MatchMode.CONTAINS:
+                alternatives.append(re.escape(rule.pattern_str))
+            elif rule._compiled_regex is not None and not rule._compiled_regex.groups:
+                alternatives.append(rule._compiled_regex.pattern)
+            else:
+                # Capturing groups would renumber backreferences once joined, keep such rules separate
+                self.fallback_rules.append(rule)
+
+        if alternatives:
+            try:
+                self.pattern = _compile_rule_regex('|'.join(f'(?:{alt})' for alt in alternatives), case_sensitive)
+            except re.error:
+                # e.g. inline global flags that are only valid at the start of a pattern
+                self.fallback_rules = [rule for rule in rules if rule.mode != MatchMode.EXACT]
+
+    def matches(self, item: BaseFileInfo) -> bool:
+        value_to_match = _get_match_value(item, self.target, self.case_sensitive)
+        if value_to_match is None:
+            return False
+        if value_to_match in self.exact_values:
+            return True
+        if self.pattern is not None and self.pattern.search(value_to_match):
+            return True
+        for rule in self.fallback_rules:
+            if rule.matches(item):
+                return True
+        return False
+
 class ItemFilter:
+    __slots__ = ("exclusion_rules", "_file_buckets", "_folder_buckets")
+
     def __init__(self, exclusion_rules: Optional[List[ExclusionRule]] = None):
         self.exclusion_rules: List[ExclusionRule] = exclusion_rules or []
+        # Buckets applicable to files (ANY + FILE) and to folders (ANY + FOLDER), built lazily
+        self._file_buckets: Optional[List[_RuleBucket]] = None
+        self._folder_buckets: Optional[List[_RuleBucket]] = None
 
     def add_rule(self, rule: ExclusionRule):
         self.exclusion_rules.append(rule)
+        self._file_buckets = None
+        self._folder_buckets = None
+
+    def _build_buckets(self) -> None:
+        # ANY rules join both sides, so each side has a single bucket per (target, case_sensitive)
+        # and an item's name/path/extension is lowered at most once per target
+        file_grouped: Dict[Tuple[MatchTarget, bool], List[ExclusionRule]] = defaultdict(list)
+        folder_grouped: Dict[Tuple[MatchTarget, bool], List[ExclusionRule]] = defaultdict(list)
+        for rule in self.exclusion_rules:
+            key = (rule.target, rule.case_sensitive)
+            if rule.item_type != ItemType.FOLDER:
+                file_grouped[key].append(rule)
+            if rule.item_type != ItemType.FILE:
+                folder_grouped[key].append(rule)
+        self._file_buckets = [_RuleBucket(target, case_sensitive, rules)
+                              for (target, case_sensitive), rules in file_grouped.items()]
+        self._folder_buckets = [_RuleBucket(target, case_sensitive, rules)
+                                for (target, case_sensitive), rules in folder_grouped.items()
+                                if target != MatchTarget.EXTENSION]
 
     def should_exclude(self, item: BaseFileInfo) -> bool:
         if not self.exclusion_rules:
             return False
-        for rule in self.exclusion_rules:
-            if rule.matches(item):
+        if self._file_buckets is None:
+            self._build_buckets()
+        # Only rules whose item_type can apply to this item are examined
+        for bucket in self._folder_buckets if item.is_folder else self._file_buckets:
+            if bucket.matches(item):
                 return True
         return False
 
+    def filter_items(self, items: List[BaseFileInfo]) -> List[BaseFileInfo]:
+        """Batch form of should_exclude: returns the items that are kept, in their original order."""
+        if not self.exclusion_rules:
+            return list(items)
+        if self._file_buckets is None:
+            self._build_buckets()
+        # Bucket lists are resolved once for the whole batch instead of once per item
+        file_buckets = self._file_buckets
+        folder_buckets = self._folder_buckets
+        kept: List[BaseFileInfo] = []
+        for item in items:
+            for bucket in folder_buckets if item.is_folder else file_buckets:
+                if bucket.matches(item):
+                    break
+            else:
+                kept.append(item)
+        return kept
+
 class RenameRule:
+    __slots__ = ("match_regex_str", "replace_string", "target_scope", "case_sensitive", "compiled_regex")
+
     def __init__(self,
                  match_regex: str,
                  replace_string: str,
@@ -700,9 +865,7 @@ class RenameRule:
         self.case_sensitive = case_sensitive
         
         try:
-            self.compiled_regex = re.compile(
-                self.match_regex_str, 0 if self.case_sensitive else re.IGNORECASE
-            )
+            self.compiled_regex = _compile_rule_regex(self.match_regex_str, self.case_sensitive)
         except re.error as e:
             raise ValueError(f"Invalid regex pattern '{self.match_regex_str}' in RenameRule: {e}")
 
@@ -723,27 +886,14 @@ class RenameRule:
             if original_path == original_name: # Item is at root, path is just its name
                 return new_name.replace("\\", "/") 
             
-            try:
-                # Use PurePosixPath for robust parent path detection and joining
-                # Assumes item.file_path is in POSIX format or convertible
-                path_obj = PurePosixPath(original_path)
-                base_path = path_obj.parent
-                # str(base_path) might be '.' if original_path has no directory part (e.g. "file.txt")
-                # In such a case, new_path should just be new_name.
-                if str(base_path) == "." and not '/' in original_path:
-                    return new_name.replace("\\", "/")
-                return str(base_path / new_name).replace("\\", "/")
-            except Exception:
-                 # Fallback for any path manipulation issue (should be rare with PurePosixPath)
-                if original_path.endswith(original_name):
-                    base_path_str = original_path[:-len(original_name)]
-                    if not base_path_str and original_path != original_name: 
-                        return new_name.replace("\\", "/")
-                    # Ensure base_path_str ends with a slash if it's not empty and not already ending with slash
-                    if base_path_str and not base_path_str.endswith('/'):
-                         base_path_str += '/'
-                    return (base_path_str + new_name).replace("\\", "/")
-                return None # Cannot reliably determine base path
+            # Slice the parent off with rfind instead of building a PurePosixPath per call
+            idx = original_path.rfind('/')
+            if idx < 0: # No directory part (e.g. "file.txt")
+                return new_name.replace("\\", "/")
+            base_path = original_path[:idx] or "/" # "/file.txt" lives directly under the root
+            if not new_name: # Name removed entirely, the parent itself is the result
+                return base_path.replace("\\", "/")
+            return (base_path + new_name if idx == 0 else base_path + "/" + new_name).replace("\\", "/")
 
         elif self.target_scope == MatchTarget.PATH:
             new_path = self.compiled_regex.sub(self.replace_string, original_path)
@@ -753,6 +903,21 @@ class RenameRule:
         
         return None # Should not be reached if target_scope is validated
 
+def _calculate_target_path(target_base_path: str, relative_path: str) -> str:
+    """
+    计算源文件在目标位置的完整路径（只计算路径不计算file_id）
+    
+    :param target_base_path: 已去除结尾/的目标基础路径
+    :param relative_path: 源文件相对于源基础路径的相对路径
+    :return: 目标完整路径
+    """
+    # 构建目标完整路径 - 使用POSIX路径拼接；相对路径通常已带前导/，直接拼接即可，无需再扫描替换 //
+    if not relative_path:
+        return target_base_path
+    if relative_path[0] == "/":
+        return target_base_path + relative_path
+    return f"{target_base_path}/{relative_path}"
+
 def compare_drive_lists(
     source_list: List[BaseFileInfo],
     target_list: List[BaseFileInfo],
@@ -772,40 +937,35 @@ def compare_drive_lists(
     :param target_base_path: 目标目录的基础路径，用于计算相对路径
     :return: 比较结果字典，包含 to_add, to_update_in_target, to_delete_from_target, to_rename_in_target 字段
     """
-    def get_relative_path(full_path: str, base_path: str) -> str:
-        """获取相对路径"""
-        if not base_path:
-            return full_path
-        # 确保路径以/开头
-        full_path = full_path if full_path.startswith('/') else '/' + full_path
-        base_path = base_path if base_path.startswith('/') else '/' + base_path
-        # 移除结尾的/
-        base_path = base_path.rstrip('/')
-        if full_path.startswith(base_path):
-            return full_path[len(base_path):]
-        return full_path
-
-    def calculate_target_path(source_item: BaseFileInfo) -> str:
+    def make_relative_path_getter(base_path: str) -> Callable[[str], str]:
         """
-        计算源文件在目标位置的完整路径（简化版，只计算路径不计算file_id）
+        为已去除结尾/的基础路径构建相对路径函数，基础路径只规范化一次
         
-        :param source_item: 源文件信息
-        :return: 目标完整路径
+        :param base_path: 基础路径
+        :return: 将完整路径转换为相对路径的函数
         """
-        # 使用 get_relative_path 函数获取相对路径
-        relative_path = get_relative_path(source_item.file_path, source_base_path)
-        
-        # 构建目标完整路径 - 使用POSIX路径拼接
-        if relative_path:
-            target_full_path = f"{target_base_path}/{relative_path}".replace("//", "/")
-        else:
-            target_full_path = target_base_path
-        
-        return target_full_path
+        if not base_path:
+            return lambda full_path: full_path
+        # 确保基础路径以/开头
+        if not base_path.startswith('/'):
+            base_path = '/' + base_path
+        base_len = len(base_path)
+
+        def get_relative_path(full_path: str) -> str:
+            # 确保路径以/开头
+            if full_path[:1] != '/':
+                full_path = '/' + full_path
+            if full_path.startswith(base_path):
+                return full_path[base_len:]
+            return full_path
+
+        return get_relative_path
 
     # 规范化基础路径
     source_base_path = source_base_path.rstrip('/')
     target_base_path = target_base_path.rstrip('/')
+    get_source_relative_path = make_relative_path_getter(source_base_path)
+    get_target_relative_path = make_relative_path_getter(target_base_path)
 
     results: Dict[str, List[Any]] = {
         "to_add": [],
@@ -814,112 +974,102 @@ def compare_drive_lists(
         "to_rename_in_target": []
     }
 
-    # 创建相对路径映射
+    # 每个条目的相对路径只计算一次；同一相对路径出现多次时保留最后一个条目（位置沿用首次出现处）
     source_map_by_rel_path: Dict[str, BaseFileInfo] = {
-        get_relative_path(item.file_path, source_base_path): item 
+        get_source_relative_path(item.file_path): item
         for item in source_list
     }
     target_map_by_rel_path: Dict[str, BaseFileInfo] = {
-        get_relative_path(item.file_path, target_base_path): item 
+        get_target_relative_path(item.file_path): item
         for item in target_list
     }
 
-    accounted_source_paths: Set[str] = set()
+    if mode == SyncMethod.OVERWRITE.value:
+        # 覆盖同步：删除目标目录里的所有文件，然后保存源目录里的所有文件；
+        # 更新、重命名和增量添加的结果都会被丢弃，因此直接组装，不再逐项比较
+        results["to_delete_from_target"] = list(target_map_by_rel_path.values())
+        results["to_add"] = [
+            {"source_item": src_item, "target_path": _calculate_target_path(target_base_path, src_rel_path)}
+            for src_rel_path, src_item in source_map_by_rel_path.items()
+        ]
+        return results
+
     accounted_target_paths: Set[str] = set()
+    # 目标侧没有同路径条目的源条目，留给重命名检测和添加
+    unmatched_src_items: List[Tuple[str, BaseFileInfo]] = []
 
     # 1. First Pass: Exact path matches (for updates)
+    # 每个源条目只做一次 dict.get 查找目标侧同路径条目
+    get_target_item = target_map_by_rel_path.get
     for src_rel_path, src_item in source_map_by_rel_path.items():
-        if src_rel_path in target_map_by_rel_path:
-            target_item = target_map_by_rel_path[src_rel_path]
-            
-            is_different = False
-            if src_item.is_folder != target_item.is_folder:
+        target_item = get_target_item(src_rel_path)
+        if target_item is None:
+            unmatched_src_items.append((src_rel_path, src_item))
+            continue
+        accounted_target_paths.add(src_rel_path)
+
+        is_folder_src = src_item.is_folder
+        is_different = False
+        if is_folder_src != target_item.is_folder:
+            is_different = True
+        elif not is_folder_src: # If they are both files, compare size
+            if src_item.file_size != target_item.file_size:
                 is_different = True
-            elif not src_item.is_folder: # If they are both files, compare size
-                if src_item.file_size != target_item.file_size:
-                    is_different = True
 
-            if is_different:
-                results["to_update_in_target"].append({"source": src_item, "target": target_item})
-            
-            accounted_source_paths.add(src_rel_path)
-            accounted_target_paths.add(src_rel_path)
+        if is_different:
+            results["to_update_in_target"].append({"source": src_item, "target": target_item})
 
     # 2. Second Pass: Rename detection (using remaining unaccounted items)
-    if rename_rules:
-        unaccounted_src_items = [(p, i) for p, i in source_map_by_rel_path.items() if p not in accounted_source_paths]
+    renamed_source_paths: Set[str] = set()
+    if rename_rules and unmatched_src_items:
         unaccounted_tgt_items = [(p, i) for p, i in target_map_by_rel_path.items() if p not in accounted_target_paths]
         
+        # Reverse index: each rule is applied to each unaccounted target exactly once, keyed by the
+        # path it would be renamed to. Insertion order (target first, then rule) keeps the original
+        # first-match semantics of the nested loop.
+        rename_candidates: Dict[str, List[Tuple[str, BaseFileInfo, RenameRule]]] = defaultdict(list)
+        for target_rel_path, target_item in unaccounted_tgt_items:
+            for rule in rename_rules:
+                suggested_new_path = rule.generate_new_path(target_item)
+                if suggested_new_path:
+                    rename_candidates[suggested_new_path].append((target_rel_path, target_item, rule))
 
-        for src_rel_path, src_item in unaccounted_src_items:
-            if src_rel_path in accounted_source_paths:
-                continue
-            
-            found_rename_for_current_source = False
-            for target_rel_path, target_item in unaccounted_tgt_items:
+        for src_rel_path, src_item in unmatched_src_items:
+            for target_rel_path, target_item, rule in rename_candidates.get(src_item.file_path, ()):
                 if target_rel_path in accounted_target_paths:
                     continue
-
                 # Basic compatibility check (type and size for files)
                 if src_item.is_folder == target_item.is_folder and \
                    (src_item.is_folder or src_item.file_size == target_item.file_size):
-                    
-                    for rule in rename_rules:
-                        suggested_new_path = rule.generate_new_path(target_item)
-                        if suggested_new_path and suggested_new_path == src_item.file_path:
-                            results["to_rename_in_target"].append({
-                                'target_item': target_item,
-                                'suggested_new_path': src_item.file_path,
-                                'source_item': src_item,
-                                'applied_rule_pattern': rule.match_regex_str
-                            })
-                            accounted_source_paths.add(src_rel_path)
-                            accounted_target_paths.add(target_rel_path)
-                            found_rename_for_current_source = True
-                            break
-                
-                if found_rename_for_current_source:
+                    results["to_rename_in_target"].append({
+                        'target_item': target_item,
+                        'suggested_new_path': src_item.file_path,
+                        'source_item': src_item,
+                        'applied_rule_pattern': rule.match_regex_str
+                    })
+                    renamed_source_paths.add(src_rel_path)
+                    accounted_target_paths.add(target_rel_path)
                     break
 
     # 3. Third Pass: Remaining items are true adds/deletes
-    for src_rel_path, src_item in source_map_by_rel_path.items():
-        if src_rel_path not in accounted_source_paths:
-            # 简化的添加项信息，只包含源文件和目标路径
-            target_full_path = calculate_target_path(src_item)
-            
-            add_item = {
-                "source_item": src_item,
-                "target_path": target_full_path
-            }
-            results["to_add"].append(add_item)
+    for src_rel_path, src_item in unmatched_src_items:
+        if src_rel_path in renamed_source_paths:
+            continue
+        # 简化的添加项信息，只包含源文件和目标路径
+        results["to_add"].append({
+            "source_item": src_item,
+            "target_path": _calculate_target_path(target_base_path, src_rel_path)
+        })
 
     # 根据同步模式处理删除操作
     if mode == SyncMethod.FULL.value:
         # 完全同步：删除目标中多余的文件（源中不存在的文件）
-        for target_rel_path, target_item in target_map_by_rel_path.items():
-            if target_rel_path not in accounted_target_paths:
-                results["to_delete_from_target"].append(target_item)
-    elif mode == SyncMethod.OVERWRITE.value:
-        # 覆盖同步：删除目标目录里的所有文件，然后保存源目录里的所有文件
-        # 1. 将所有目标文件标记为删除
-        for target_rel_path, target_item in target_map_by_rel_path.items():
-            results["to_delete_from_target"].append(target_item)
-        
-        # 2. 将所有源文件标记为添加（清空之前的添加列表，重新添加所有源文件）
-        results["to_add"] = []  # 清空之前的添加列表
-        results["to_update_in_target"] = []  # 清空更新列表，覆盖模式不需要更新
-        results["to_rename_in_target"] = []  # 清空重命名列表，覆盖模式不需要重命名
-        
-        for src_rel_path, src_item in source_map_by_rel_path.items():
-            # 计算目标路径信息
-            target_full_path = calculate_target_path(src_item)
-            
-            # 构建添加项信息
-            add_item = {
-                "source_item": src_item,
-                "target_path": target_full_path
-            }
-            results["to_add"].append(add_item)
+        # 按目标列表顺序遍历，保证删除顺序（以及删除批次的合并结果）每次一致
+        results["to_delete_from_target"] = [
+            target_item
+            for target_rel_path, target_item in target_map_by_rel_path.items()
+            if target_rel_path not in accounted_target_paths
+        ]
     
     return results
 
@@ -927,47 +1077,92 @@ def _parse_exclusion_rules(rules_def: Optional[List[ExclusionRuleDefinition]]) -
     if not rules_def:
         return None
     
-    item_filter = ItemFilter()
-    
+    rule_keys = []
     for i, rule_data in enumerate(rules_def):
         try:
             # 确保枚举类型正确转换
             target_enum = rule_data.target if isinstance(rule_data.target, MatchTarget) else MatchTarget(rule_data.target)
             item_type_enum = rule_data.item_type if isinstance(rule_data.item_type, ItemType) else ItemType(rule_data.item_type)
             mode_enum = rule_data.mode if isinstance(rule_data.mode, MatchMode) else MatchMode(rule_data.mode)
-            
+        except ValueError as e:
+            # 抛出一个特定的错误，可以被 API 层捕获
+            logger.error("[ExclusionRules] 规则 #%d 解析失败: %s", i + 1, e)
+            raise ValueError(f"排除规则 #{i+1} ('{rule_data.pattern}') 格式错误: {e}")
+        rule_keys.append((rule_data.pattern, target_enum, item_type_enum, mode_enum, rule_data.case_sensitive))
+    
+    # 相同规则定义在多次同步之间复用同一个过滤器
+    return _build_item_filter(tuple(rule_keys))
+
+@lru_cache(maxsize=128)
+def _build_item_filter(rule_keys: Tuple[Tuple[str, MatchTarget, ItemType, MatchMode, bool], ...]) -> ItemFilter:
+    item_filter = ItemFilter()
+    
+    for i, (pattern, target, item_type, mode, case_sensitive) in enumerate(rule_keys):
+        try:
             exclusion_rule = ExclusionRule(
-                pattern=rule_data.pattern,
-                target=target_enum,
-                item_type=item_type_enum,
-                mode=mode_enum,
-                case_sensitive=rule_data.case_sensitive
+                pattern=pattern,
+                target=target,
+                item_type=item_type,
+                mode=mode,
+                case_sensitive=case_sensitive
             )
             item_filter.add_rule(exclusion_rule)
             
         except ValueError as e:
             # 抛出一个特定的错误，可以被 API 层捕获
-            logger.error(f"[ExclusionRules] 规则 #{i+1} 解析失败: {e}")
-            raise ValueError(f"排除规则 #{i+1} ('{rule_data.pattern}') 格式错误: {e}")
+            logger.error("[ExclusionRules] 规则 #%d 解析失败: %s", i + 1, e)
+            raise ValueError(f"排除规则 #{i+1} ('{pattern}') 格式错误: {e}")
     
     return item_filter
 
 def _parse_rename_rules(rules_def: Optional[List[RenameRuleDefinition]]) -> Optional[List[RenameRule]]:
     if not rules_def:
         return None
+    rule_keys = tuple(
+        (rule_data.match_regex, rule_data.replace_string, rule_data.target_scope, rule_data.case_sensitive)
+        for rule_data in rules_def
+    )
+    # 相同规则定义在多次同步之间复用已构建的规则对象
+    return list(_build_rename_rules(rule_keys))
+
+@lru_cache(maxsize=128)
+def _build_rename_rules(rule_keys: Tuple[Tuple[str, str, MatchTarget, bool], ...]) -> Tuple[RenameRule, ...]:
     parsed_rules = []
-    for i, rule_data in enumerate(rules_def):
+    for i, (match_regex, replace_string, target_scope, case_sensitive) in enumerate(rule_keys):
         try:
             parsed_rules.append(RenameRule(
-                match_regex=rule_data.match_regex,
-                replace_string=rule_data.replace_string,
-                target_scope=rule_data.target_scope,
-                case_sensitive=rule_data.case_sensitive
+                match_regex=match_regex,
+                replace_string=replace_string,
+                target_scope=target_scope,
+                case_sensitive=case_sensitive
             ))
         except ValueError as e:
             # Raise a specific error that can be caught by the API layer
-            raise ValueError(f"重命名规则 #{i+1} ('{rule_data.match_regex}') 格式错误: {e}")
-    return parsed_rules
+            raise ValueError(f"重命名规则 #{i+1} ('{match_regex}') 格式错误: {e}")
+    return tuple(parsed_rules)
+
+def _target_parent_path(target_path: str) -> str:
+    """
+    计算待添加项目在目标端的父目录路径（文件与文件夹规则相同）
+    
+    :param target_path: 目标完整路径
+    :return: 父目录路径
+    """
+    return posixpath.dirname(target_path)
+
+def _group_add_items_by_parent(to_add: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    按目标父目录对待添加项目分组，每个项目的父目录只计算一次
+    
+    :param to_add: 待添加项目列表
+    :return: 目标父目录路径到待添加项目列表的映射（没有目标路径的项目不参与分组）
+    """
+    items_by_parent: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for add_item in to_add:
+        target_path = add_item.get("target_path", "")
+        if target_path:
+            items_by_parent[_target_parent_path(target_path)].append(add_item)
+    return items_by_parent
 
 async def _create_directories_intelligently(
     drive_manager: Any,
@@ -975,39 +1170,31 @@ async def _create_directories_intelligently(
     to_add: List[Dict[str, Any]],
     target_definition: DiskTargetDefinition,
     drive_type_str: str,
-    existing_path_mapping: Dict[str, str]
+    existing_path_mapping: Dict[str, str],
+    items_by_parent: Optional[Dict[str, List[Dict[str, Any]]]] = None
 ) -> Dict[str, str]:
     """
     智能分析并创建所需目录，返回完整的路径映射
     
+    按深度逐层创建，每层通过一次批量调用串行创建；上一层全部完成后再创建下一层
+    
     :param drive_manager: 网盘管理器实例
     :param x_token: 认证令牌
     :param to_add: 待添加项目列表
     :param target_definition: 目标定义
     :param drive_type_str: 网盘类型字符串
     :param existing_path_mapping: 现有的路径到file_id映射
+    :param items_by_parent: 调用方已按目标父目录分组的 to_add，提供时不再重新遍历 to_add
     :return: 完整的路径到file_id映射（包含新创建的目录）
     """
     # 复制现有映射，避免修改原始数据
     complete_path_mapping = existing_path_mapping.copy()
     
-    # 1. 收集所有需要的目录路径
-    required_dirs = set()
-    for add_item in to_add:
-        target_path = add_item.get("target_path", "")
-        if target_path:
-            # 对于文件，需要其父目录；对于文件夹，需要其本身的父目录
-            source_item = add_item.get("source_item")
-            if source_item and not source_item.is_folder:
-                # 文件：需要其父目录
-                parent_dir = os.path.dirname(target_path).replace("\\", "/")
-                if parent_dir and parent_dir != "/" and parent_dir != target_definition.file_path:
-                    required_dirs.add(parent_dir)
-            else:
-                # 文件夹：需要其父目录（文件夹本身会在转存时创建）
-                parent_dir = os.path.dirname(target_path).replace("\\", "/")
-                if parent_dir and parent_dir != "/" and parent_dir != target_definition.file_path:
-                    required_dirs.add(parent_dir)
+    # 1. 收集所有需要的目录路径（文件和文件夹都只需要其父目录，文件夹本身会在转存时创建）
+    if items_by_parent is None:
+        items_by_parent = _group_add_items_by_parent(to_add)
+    root_aliases = frozenset(("", "/", target_definition.file_path))
+    required_dirs = {parent_dir for parent_dir in items_by_parent if parent_dir not in root_aliases}
     
     # 2. 过滤掉已存在的目录
     missing_dirs = [d for d in required_dirs if d not in complete_path_mapping]
@@ -1016,63 +1203,69 @@ async def _create_directories_intelligently(
         # logger.info("所有需要的目录都已存在，无需创建新目录")
         return complete_path_mapping
     
-    # 3. 按深度排序，确保先创建父目录
-    sorted_dirs = sorted(missing_dirs, key=lambda x: x.count('/'))
+    # 3. 按深度分层，确保先创建父目录
+    dirs_by_depth: Dict[int, List[str]] = defaultdict(list)
+    for dir_path in missing_dirs:
+        dirs_by_depth[dir_path.count('/')].append(dir_path)
     
-    # logger.info(f"需要创建 {len(sorted_dirs)} 个目录: {sorted_dirs}")
+    logger.debug("需要创建 %d 个目录: %s", len(missing_dirs), missing_dirs)
     
-    # 4. 逐个创建目录并更新映射
+    def build_mkdir_params(dir_path: str) -> Optional[MkdirParam]:
+        # 确保路径格式正确
+        normalized_dir_path = dir_path.replace("\\", "/")
+        
+        # 计算父目录路径和目录名（一次 rpartition，无需拆分再拼接整条路径）
+        parent_part, _, dir_name = normalized_dir_path.strip("/").rpartition("/")
+        if not parent_part:
+            logger.warning("跳过根目录或无效路径: %s", normalized_dir_path)
+            return None
+        parent_path = "/" + parent_part
+        
+        # 查找父目录的file_id
+        if parent_path == target_definition.file_path:
+            # 父目录是根目录
+            parent_file_id = target_definition.file_id
+        elif parent_path in complete_path_mapping:
+            # 父目录在映射中（可能是已存在的或上一层刚创建的）
+            parent_file_id = complete_path_mapping[parent_path]
+        else:
+            logger.warning("无法找到父目录 %s 的file_id，跳过创建 %s", parent_path, normalized_dir_path)
+            return None
+        
+        # 构建 MkdirParam（return_if_exist 默认为 True，重复创建是幂等的）
+        return MkdirParam(
+            drive_type=drive_type_str,
+            file_path=normalized_dir_path,
+            parent_id=parent_file_id,
+            file_name=dir_name
+        )
+
+    # 4. 逐层批量创建目录并更新映射
     created_count = 0
-    for dir_path in sorted_dirs:
-        try:
-            # 确保路径格式正确
-            normalized_dir_path = dir_path.replace("\\", "/")
-            
-            # 计算父目录路径和目录名
-            path_parts = normalized_dir_path.strip("/").split("/")
-            if len(path_parts) <= 1:
-                logger.warning(f"跳过根目录或无效路径: {normalized_dir_path}")
-                continue
-                
-            parent_path_parts = path_parts[:-1]
-            parent_path = "/" + "/".join(parent_path_parts) if parent_path_parts else "/"
-            dir_name = path_parts[-1]
-            
-            # 查找父目录的file_id
-            parent_file_id = None
-            
-            if parent_path == target_definition.file_path:
-                # 父目录是根目录
-                parent_file_id = target_definition.file_id
-            elif parent_path in complete_path_mapping:
-                # 父目录在映射中（可能是已存在的或刚创建的）
-                parent_file_id = complete_path_mapping[parent_path]
-            else:
-                logger.warning(f"无法找到父目录 {parent_path} 的file_id，跳过创建 {normalized_dir_path}")
+    for depth in sorted(dirs_by_depth):
+        level_params: List[MkdirParam] = []
+        for dir_path in dirs_by_depth[depth]:
+            try:
+                mkdir_params = build_mkdir_params(dir_path)
+            except ValidationError as e:
+                # 网络错误已由 create_mkdirs 按目录收集，这里只会出现参数校验失败
+                logger.error("构建目录 %s 的创建参数失败: %s", dir_path, e)
                 continue
-            
-            # 构建 MkdirParam
-            mkdir_params = MkdirParam(
-                drive_type=drive_type_str,
-                file_path=normalized_dir_path,
-                parent_id=parent_file_id,
-                file_name=dir_name
-            )
-            
-            # 创建目录
-            new_dir_info = await drive_manager.create_mkdir(x_token, mkdir_params)
-            if new_dir_info and hasattr(new_dir_info, 'file_id'):
-                complete_path_mapping[normalized_dir_path] = new_dir_info.file_id
+            if mkdir_params is not None:
+                level_params.append(mkdir_params)
+        
+        results = await drive_manager.create_mkdirs(x_token, level_params)
+        for dir_path, new_dir_info, error in results:
+            if error is not None:
+                logger.error("创建目录 %s 时发生错误: %s", dir_path, error)
+            elif new_dir_info and hasattr(new_dir_info, 'file_id'):
+                complete_path_mapping[dir_path] = new_dir_info.file_id
                 created_count += 1
-                # logger.info(f"创建目录成功: {normalized_dir_path} (file_id: {new_dir_info.file_id})")
+                logger.debug("创建目录成功: %s (file_id: %s)", dir_path, new_dir_info.file_id)
             else:
-                logger.warning(f"创建目录失败: {normalized_dir_path}")
-                
-        except Exception as e:
-            logger.error(f"创建目录 {dir_path} 时发生错误: {e}")
-            continue
+                logger.warning("创建目录失败: %s", dir_path)
     
-    # logger.info(f"智能目录创建完成，成功创建 {created_count}/{len(sorted_dirs)} 个目录")
+    logger.debug("智能目录创建完成，成功创建 %d/%d 个目录", created_count, len(missing_dirs))
     return complete_path_mapping
 
 async def _create_missing_target_directories(
@@ -1112,13 +1305,50 @@ async def _create_missing_target_directories(
         if target_path:
             source_item = add_item.get("source_item")
             if source_item and not source_item.is_folder:
-                parent_path = os.path.dirname(target_path).replace("\\", "/")
+                parent_path = _target_parent_path(target_path)
                 if parent_path in updated_mapping:
                     # 添加兼容字段
                     add_item["target_parent_path"] = parent_path
                     add_item["target_parent_file_id"] = updated_mapping[parent_path]
                     add_item["target_full_path"] = target_path
 
+def _listing_cache_key(
+    drive_type_str: str,
+    x_token: str,
+    is_source: bool,
+    definition: Union[ShareSourceDefinition, DiskTargetDefinition],
+    recursive: bool,
+    recursion_speed: RecursionSpeed,
+    item_filter_instance: Optional[ItemFilter]
+) -> Tuple[Any, ...]:
+    """
+    构建列表缓存键
+    
+    令牌只以摘要形式参与键值，避免在缓存中长期持有 cookies 原文
+    
+    :param drive_type_str: 网盘类型字符串
+    :param x_token: 认证令牌
+    :param is_source: 是否为源端数据
+    :param definition: 路径定义（源或目标）
+    :param recursive: 是否递归
+    :param recursion_speed: 递归速度
+    :param item_filter_instance: 项目过滤器实例
+    :return: 缓存键
+    """
+    token_hash = hashlib.blake2b(x_token.encode(), digest_size=8).hexdigest()
+    return (
+        drive_type_str,
+        token_hash,
+        is_source,
+        definition.file_path,
+        getattr(definition, "file_id", None),
+        getattr(definition, "source_type", None),
+        getattr(definition, "source_id", None),
+        recursive,
+        recursion_speed.value,
+        item_filter_instance,
+    )
+
 async def _get_list_for_compare_op(
     drive_manager: Any,
     x_token: str,
@@ -1127,11 +1357,16 @@ async def _get_list_for_compare_op(
     top_level_recursive: bool,
     top_level_recursion_speed: RecursionSpeed,
     item_filter_instance: Optional[ItemFilter],
-    drive_type_str: str
+    drive_type_str: str,
+    force_refresh: bool = False
 ) -> Tuple[List[BaseFileInfo], float]:
     """
     获取列表数据用于比较操作
     
+    比较结果会直接用于建目录、转存和删除，目标列表因此每次都重新获取，避免按过期列表误删；
+    源（分享）列表在进程内缓存 _LISTING_CACHE_TTL 秒，账号经由客户端发生任何写操作后缓存即失效，
+    命中缓存时耗时记为 0
+    
     :param drive_manager: 网盘管理器实例
     :param x_token: 认证令牌
     :param is_source: 是否为源端数据
@@ -1140,8 +1375,29 @@ async def _get_list_for_compare_op(
     :param top_level_recursion_speed: 递归速度
     :param item_filter_instance: 项目过滤器实例
     :param drive_type_str: 网盘类型字符串
+    :param force_refresh: 是否忽略源列表缓存强制重新获取
     :return: 文件列表和耗时
     """
+    cache_key = None
+    now = time.monotonic()
+    if is_source:
+        # 写操作计数在获取列表之前读取，获取期间发生的写操作同样会使本次结果失效
+        drive_client = drive_manager.get_client(x_token, drive_type_str)
+        write_generation = drive_client.write_generation
+        cache_key = _listing_cache_key(
+            drive_type_str, x_token, is_source, definition, top_level_recursive, top_level_recursion_speed,
+            item_filter_instance
+        )
+        if not force_refresh:
+            with _listing_cache_lock:
+                cached = _listing_cache.get(cache_key)
+                if (
+                    cached is not None and now - cached[0] < _LISTING_CACHE_TTL
+                    and cached[1] is drive_client and cached[2] == write_generation
+                ):
+                    _listing_cache.move_to_end(cache_key)
+                    return list(cached[3]), 0.0
+
     start_time = time.time()
     result_list: List[BaseFileInfo] = []
     
@@ -1179,14 +1435,40 @@ async def _get_list_for_compare_op(
     # 应用过滤器（双重保险，虽然客户端已经应用了过滤器）
     if item_filter_instance:
         original_count = len(result_list)
-        result_list = [item for item in result_list if not item_filter_instance.should_exclude(item)]
+        result_list = item_filter_instance.filter_items(result_list)
         filtered_count = original_count - len(result_list)
         if filtered_count > 0:
-            # logger.info(f"[ItemFilter] 在服务层额外过滤了 {filtered_count} 个项目")
-            pass
+            logger.debug("[ItemFilter] 在服务层额外过滤了 %d 个项目", filtered_count)
     
     elapsed_time = time.time() - start_time
-    return result_list, elapsed_time
+    if cache_key is None:
+        return result_list, elapsed_time
+
+    with _listing_cache_lock:
+        # 写入时清理所有过期条目，避免键已变化（新的过滤器实例、令牌更换等）的完整列表长期占用内存
+        expired_keys = [key for key, entry in _listing_cache.items() if now - entry[0] >= _LISTING_CACHE_TTL]
+        for key in expired_keys:
+            del _listing_cache[key]
+        _listing_cache[cache_key] = (now, drive_client, write_generation, result_list)
+        _listing_cache.move_to_end(cache_key)
+        while len(_listing_cache) > _LISTING_CACHE_MAX_ENTRIES:
+            _listing_cache.popitem(last=False)
+
+    return list(result_list), elapsed_time
+
+def _build_compare_detail(compare_detail_data: Dict[str, Any]) -> GetCompareDetail:
+    """
+    组装比较结果模型
+    
+    各字段都是已校验的 BaseFileInfo/定义对象或由它们组装的字典，跳过 pydantic 对每一项的重新校验和字典复制，
+    只将 drive_type 转换为枚举
+    
+    :param compare_detail_data: GetCompareDetail 的全部字段
+    :return: 比较结果详情
+    """
+    return GetCompareDetail.model_construct(
+        **{**compare_detail_data, "drive_type": DriveType(compare_detail_data["drive_type"])}
+    )
 
 async def perform_comparison_logic(
     drive_manager: Any,
@@ -1198,7 +1480,8 @@ async def perform_comparison_logic(
     comparison_mode: str, 
     exclude_rules_def: Optional[List[ExclusionRuleDefinition]],
     rename_rules_def: Optional[List[RenameRuleDefinition]],
-    drive_type_str: str
+    drive_type_str: str,
+    force_refresh: bool = False
 ) -> GetCompareDetail:
     """
     执行比较逻辑
@@ -1213,6 +1496,7 @@ async def perform_comparison_logic(
     :param exclude_rules_def: 排除规则定义
     :param rename_rules_def: 重命名规则定义
     :param drive_type_str: 网盘类型字符串
+    :param force_refresh: 是否忽略源列表缓存强制重新获取
     :return: 比较结果详情
     """
     
@@ -1221,27 +1505,31 @@ async def perform_comparison_logic(
     # 覆盖模式的简化处理：只处理一层目录，不递归
     if comparison_mode == SyncMethod.OVERWRITE.value:
         # 1. 只获取源目录下的一层文件列表（不递归）
-        source_list, source_time = await _get_list_for_compare_op(
-            drive_manager=drive_manager,
-            x_token=x_token,
-            is_source=True,
-            definition=source_definition,
-            top_level_recursive=False,  # 覆盖模式不递归
-            top_level_recursion_speed=recursion_speed,
-            item_filter_instance=common_item_filter,
-            drive_type_str=drive_type_str
-        )
-        
         # 2. 只获取目标目录下的一层文件列表（不递归，用于删除）
-        target_list, target_time = await _get_list_for_compare_op(
-            drive_manager=drive_manager,
-            x_token=x_token,
-            is_source=False,
-            definition=target_definition,
-            top_level_recursive=False,  # 覆盖模式不递归
-            top_level_recursion_speed=recursion_speed,
-            item_filter_instance=None,  # 删除时不应用过滤器，删除所有文件
-            drive_type_str=drive_type_str
+        # 两侧列表互不依赖，并发获取
+        (source_list, source_time), (target_list, target_time) = await asyncio.gather(
+            _get_list_for_compare_op(
+                drive_manager=drive_manager,
+                x_token=x_token,
+                is_source=True,
+                definition=source_definition,
+                top_level_recursive=False,  # 覆盖模式不递归
+                top_level_recursion_speed=recursion_speed,
+                item_filter_instance=common_item_filter,
+                drive_type_str=drive_type_str,
+                force_refresh=force_refresh
+            ),
+            _get_list_for_compare_op(
+                drive_manager=drive_manager,
+                x_token=x_token,
+                is_source=False,
+                definition=target_definition,
+                top_level_recursive=False,  # 覆盖模式不递归
+                top_level_recursion_speed=recursion_speed,
+                item_filter_instance=None,  # 删除时不应用过滤器，删除所有文件
+                drive_type_str=drive_type_str,
+                force_refresh=force_refresh
+            )
         )
         
         # 3. 构建简化的比较结果：删除所有目标文件，添加所有源文件
@@ -1253,15 +1541,12 @@ async def perform_comparison_logic(
         }
         
         # 4. 将所有源文件标记为添加（只处理一层，直接转存到目标目录）
-        for src_item in source_list:
-            # 覆盖模式：直接将源文件转存到目标目录，使用原文件名
-            target_full_path = target_definition.file_path + "/" + src_item.file_name
-            
-            add_item = {
-                "source_item": src_item,
-                "target_path": target_full_path
-            }
-            comparison_result["to_add"].append(add_item)
+        # 覆盖模式：直接将源文件转存到目标目录，使用原文件名；目标前缀只拼接一次
+        target_prefix = target_definition.file_path + "/"
+        comparison_result["to_add"] = [
+            {"source_item": src_item, "target_path": target_prefix + src_item.file_name}
+            for src_item in source_list
+        ]
         
         # 5. 构建返回数据
         compare_detail_data = {
@@ -1275,38 +1560,42 @@ async def perform_comparison_logic(
             **comparison_result
         }
         
-        return GetCompareDetail(**compare_detail_data)
-    
-    # 增量同步和完全同步的正常比较逻辑
-    source_list, source_time = await _get_list_for_compare_op(
-        drive_manager=drive_manager,
-        x_token=x_token,
-        is_source=True,
-        definition=source_definition,
-        top_level_recursive=recursive,
-        top_level_recursion_speed=recursion_speed,
-        item_filter_instance=common_item_filter,
-        drive_type_str=drive_type_str
-    )
+        return _build_compare_detail(compare_detail_data)
     
-    target_list, target_time = await _get_list_for_compare_op(
-        drive_manager=drive_manager,
-        x_token=x_token,
-        is_source=False,
-        definition=target_definition,
-        top_level_recursive=recursive,
-        top_level_recursion_speed=recursion_speed,
-        item_filter_instance=common_item_filter,
-        drive_type_str=drive_type_str
+    # 增量同步和完全同步的正常比较逻辑（源和目标列表互不依赖，并发获取）
+    (source_list, source_time), (target_list, target_time) = await asyncio.gather(
+        _get_list_for_compare_op(
+            drive_manager=drive_manager,
+            x_token=x_token,
+            is_source=True,
+            definition=source_definition,
+            top_level_recursive=recursive,
+            top_level_recursion_speed=recursion_speed,
+            item_filter_instance=common_item_filter,
+            drive_type_str=drive_type_str,
+            force_refresh=force_refresh
+        ),
+        _get_list_for_compare_op(
+            drive_manager=drive_manager,
+            x_token=x_token,
+            is_source=False,
+            definition=target_definition,
+            top_level_recursive=recursive,
+            top_level_recursion_speed=recursion_speed,
+            item_filter_instance=common_item_filter,
+            drive_type_str=drive_type_str,
+            force_refresh=force_refresh
+        )
     )
     
     parsed_rename_rules = _parse_rename_rules(rename_rules_def)
 
     # 构建目标路径到file_id的映射
-    target_path_to_file_id = {}
-    for target_item in target_list:
-        if target_item.file_path and target_item.file_id:
-            target_path_to_file_id[target_item.file_path] = target_item.file_id
+    target_path_to_file_id = {
+        target_item.file_path: target_item.file_id
+        for target_item in target_list
+        if target_item.file_path and target_item.file_id
+    }
 
     # compare_drive_lists 返回基础的比较结果字典（简化版）
     comparison_result = compare_drive_lists(
@@ -1318,28 +1607,33 @@ async def perform_comparison_logic(
         target_base_path=target_definition.file_path
     )
     
+    # 按目标父目录分组一次，目录创建和下面的回填共用
+    to_add = comparison_result.get('to_add', [])
+    items_by_parent = _group_add_items_by_parent(to_add)
+
     # 使用新的智能目录创建逻辑
     complete_path_mapping = await _create_directories_intelligently(
         drive_manager=drive_manager,
         x_token=x_token,
-        to_add=comparison_result.get('to_add', []),
+        to_add=to_add,
         target_definition=target_definition,
         drive_type_str=drive_type_str,
-        existing_path_mapping=target_path_to_file_id
+        existing_path_mapping=target_path_to_file_id,
+        items_by_parent=items_by_parent
     )
     
-    # 为了保持向后兼容，更新 to_add 中的信息
-    for add_item in comparison_result.get('to_add', []):
-        target_path = add_item.get("target_path", "")
-        if target_path:
+    # 为了保持向后兼容，更新 to_add 中的信息（每个父目录只查找一次file_id）
+    for parent_path, add_items in items_by_parent.items():
+        if parent_path not in complete_path_mapping:
+            continue
+        parent_file_id = complete_path_mapping[parent_path]
+        for add_item in add_items:
             source_item = add_item.get("source_item")
             if source_item and not source_item.is_folder:
-                parent_path = os.path.dirname(target_path).replace("\\", "/")
-                if parent_path in complete_path_mapping:
-                    # 添加兼容字段
-                    add_item["target_parent_path"] = parent_path
-                    add_item["target_parent_file_id"] = complete_path_mapping[parent_path]
-                    add_item["target_full_path"] = target_path
+                # 添加兼容字段
+                add_item["target_parent_path"] = parent_path
+                add_item["target_parent_file_id"] = parent_file_id
+                add_item["target_full_path"] = add_item["target_path"]
     
     # 构建完整的 GetCompareDetail 对象所需的数据
     compare_detail_data = {
@@ -1355,7 +1649,7 @@ async def perform_comparison_logic(
     }
     
     # 返回 GetCompareDetail 模型实例
-    return GetCompareDetail(**compare_detail_data)
+    return _build_compare_detail(compare_detail_data)
 
 async def apply_comparison_operations(
     drive_manager: Any,
@@ -1363,7 +1657,7 @@ async def apply_comparison_operations(
     comparison_result: GetCompareDetail,
     drive_type_str: str,
     sync_mode: str = "incremental"
-) -> Dict[str, Dict[str, List[str]]]:
+) -> Dict[str, Dict[str, List[OperationRecord]]]:
     """
     根据比较结果执行相应的操作（添加、删除、重命名、更新）
 
@@ -1377,11 +1671,14 @@ async def apply_comparison_operations(
             "add": {"succeeded": [...], "failed": [...]},
             "delete": {"succeeded": [...], "failed": [...]}
         }
+        列表元素为 OperationRecord
     """
     operation_results = {
         "add": {"succeeded": [], "failed": []},
         "delete": {"succeeded": [], "failed": []}
     }
+    if not comparison_result.to_add and not comparison_result.to_delete_from_target:
+        return operation_results
 
     # 根据同步模式确定执行顺序
     if sync_mode == SyncMethod.OVERWRITE.value:
@@ -1400,13 +1697,13 @@ async def apply_comparison_operations(
             
             # 检查删除操作是否成功
             delete_failed_count = len(delete_results.get("failed", []))
-            delete_success_count = len(delete_results.get("succeeded", []))
-            
-            # logger.info(f"删除操作完成：成功 {delete_success_count} 个，失败 {delete_failed_count} 个")
+            logger.debug(
+                "删除操作完成：成功 %d 个，失败 %d 个", len(delete_results.get("succeeded", [])), delete_failed_count
+            )
             
             # 如果删除操作有失败，记录警告但继续执行添加操作
             if delete_failed_count > 0:
-                logger.warning(f"覆盖模式：有 {delete_failed_count} 个文件删除失败，可能影响后续转存操作")
+                logger.warning("覆盖模式：有 %d 个文件删除失败，可能影响后续转存操作", delete_failed_count)
         
         # logger.info("覆盖模式：开始执行添加操作...")
         
@@ -1423,9 +1720,10 @@ async def apply_comparison_operations(
             )
             operation_results["add"] = add_results
             
-            add_failed_count = len(add_results.get("failed", []))
-            add_success_count = len(add_results.get("succeeded", []))
-            # logger.info(f"添加操作完成：成功 {add_success_count} 个，失败 {add_failed_count} 个")
+            logger.debug(
+                "添加操作完成：成功 %d 个，失败 %d 个",
+                len(add_results.get("succeeded", [])), len(add_results.get("failed", []))
+            )
     
     elif sync_mode == SyncMethod.FULL.value:
         # 完全同步：必须先完成所有删除操作，再进行转存操作
@@ -1479,6 +1777,27 @@ async def apply_comparison_operations(
 
     return operation_results
 
+def _transfer_records(
+    add_items: List[Dict[str, Any]], status: str, detail: Optional[str] = None
+) -> List[OperationRecord]:
+    """
+    为一组待添加项目批量生成转存结果记录
+    
+    :param add_items: 待添加项目列表
+    :param status: 结果状态，如 TRANSFER_SUCCESS
+    :param detail: 附加说明（错误信息等）
+    :return: 结果记录列表
+    """
+    return [
+        OperationRecord(
+            status,
+            add_item['source_item'].file_path,
+            add_item.get('target_path', add_item.get('target_full_path', '')),
+            detail=detail
+        )
+        for add_item in add_items
+    ]
+
 async def _process_add_operations(
     drive_manager: Any,
     x_token: str,
@@ -1488,7 +1807,7 @@ async def _process_add_operations(
     drive_type_str: str,
     sync_mode: str = "incremental",
     ext_transfer_params: Optional[Dict[str, Any]] = None
-) -> Dict[str, List[str]]:
+) -> Dict[str, List[OperationRecord]]:
     """
     处理添加操作，包括创建目录和传输文件（优化版）
     
@@ -1502,159 +1821,179 @@ async def _process_add_operations(
     :return: 操作结果，包含succeeded和failed两个列表
     """
     operation_results = {'succeeded': [], 'failed': []}
+    succeeded = operation_results['succeeded']
+    failed = operation_results['failed']
 
-    # 提取source_item进行排序
-    sorted_to_add = sorted(to_add, key=lambda add_item: add_item["source_item"].file_path)
+    target_root_path = target_definition.file_path
+    target_root_id = target_definition.file_id
 
-    # 按目标父目录分组文件
+    # 覆盖模式处理所有类型的文件，其他模式只处理非文件夹；先过滤再排序，被跳过的文件夹不参与排序
+    if sync_mode == SyncMethod.OVERWRITE.value:
+        sorted_to_add = list(to_add)
+    else:
+        sorted_to_add = [add_item for add_item in to_add if not add_item["source_item"].is_folder]
+    sorted_to_add.sort(key=lambda add_item: add_item["source_item"].file_path)
+
+    # 单次遍历按目标父目录分组文件
     files_to_transfer_by_target_parent: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
     for add_item in sorted_to_add:
-        source_item = add_item["source_item"]
         target_path = add_item.get("target_path", "")
         
-        # 覆盖模式处理所有类型的文件，其他模式只处理非文件夹
-        if sync_mode == SyncMethod.OVERWRITE.value or not source_item.is_folder:
-            # 计算父目录路径
-            if source_item.is_folder:
-                # 文件夹：父目录是其上级目录
-                parent_path = os.path.dirname(target_path).replace("\\", "/")
-            else:
-                # 文件：父目录是其所在目录
-                parent_path = os.path.dirname(target_path).replace("\\", "/")
-            
-            # 确保父目录路径不为空
-            if not parent_path or parent_path == ".":
-                parent_path = target_definition.file_path
-            
-            # 添加计算出的父目录信息到add_item中（兼容旧逻辑）
-            add_item["target_parent_path"] = parent_path
-            add_item["target_full_path"] = target_path
-            
-            files_to_transfer_by_target_parent[parent_path].append(add_item)
+        # 计算父目录路径（比较阶段已回填的直接复用），为空时回退到目标根目录
+        parent_path = add_item.get("target_parent_path") or _target_parent_path(target_path)
+        if not parent_path or parent_path == ".":
+            parent_path = target_root_path
+        
+        # 添加计算出的父目录信息到add_item中（兼容旧逻辑）
+        add_item["target_parent_path"] = parent_path
+        add_item["target_full_path"] = target_path
+        
+        files_to_transfer_by_target_parent[parent_path].append(add_item)
     
-    # 串行处理每个目标父目录的转存操作
+    # 各分组共用的额外参数只取一次；每组的参数字典仍需新建，因为 files_ext_info 各不相同
+    base_ext_params = ext_transfer_params or {}
+    source_ext_params = source_definition.ext_params
+
+    # 各分组共用的转存字段只校验一次，每组基于模板复制并替换目标目录、文件ID和扩展参数
+    transfer_template: Optional[TransferParam] = None
+    template_error = ""
+    try:
+        transfer_template = TransferParam(
+            drive_type=drive_type_str,
+            source_type=source_definition.source_type,
+            source_id=source_definition.source_id,
+            source_path=source_definition.file_path,
+            target_path="/"
+        )
+    except ValueError as ex_param:
+        template_error = str(ex_param)
+
+    # 先为每个目标父目录组装转存参数，再通过一次批量调用完成全部转存
+    transfer_batches: List[Tuple[List[Dict[str, Any]], TransferParam]] = []
     for target_parent_dir, add_items_in_group in files_to_transfer_by_target_parent.items():
         if not add_items_in_group:
             continue
 
-        # 确保目标路径使用正斜杠
-        normalized_target_parent_dir = os.path.normpath(target_parent_dir).replace("\\", "/")
+        # 规范化目标路径：分组键来自 posixpath.dirname，已是 POSIX 风格，只需去掉结尾的/
+        normalized_target_parent_dir = target_parent_dir.rstrip("/") or "/"
         
-        try:
-            source_fs_ids_to_transfer = [add_item["source_item"].file_id for add_item in add_items_in_group]
-            
-            current_transfer_ext_params = {}
-            if ext_transfer_params:
-                current_transfer_ext_params = {**ext_transfer_params}
-                        
-            # 传递所有文件的完整信息，让具体的网盘客户端处理
-            # 将所有文件的 file_ext 信息传递给客户端
-            files_ext_info = []
-            for add_item in add_items_in_group:
-                source_item = add_item["source_item"]
-                file_ext_info = {
+        source_items = list(map(_get_source_item, add_items_in_group))
+        source_fs_ids_to_transfer = list(filter(None, map(_get_file_id, source_items)))
+        
+        # 没有可转存的文件ID时直接跳过，避免发起无意义的转存请求
+        if not source_fs_ids_to_transfer:
+            failed.extend(_transfer_records(add_items_in_group, "TRANSFER_SKIPPED", "缺少源文件ID"))
+            continue
+        
+        # 传递所有文件的完整信息（file_ext 由 BaseFileInfo 保证为 dict），让具体的网盘客户端处理；
+        # 第一个文件的公共参数作为基础参数，只传递公共参数，不传递特定文件的参数
+        first_source_item = source_items[0]
+        file_ext = first_source_item.file_ext
+        current_transfer_ext_params = {
+            **base_ext_params,
+            'files_ext_info': [
+                {
                     'file_id': source_item.file_id,
-                    'file_ext': source_item.file_ext if hasattr(source_item, 'file_ext') else {},
+                    'file_ext': source_item.file_ext,
                     'parent_id': source_item.parent_id
                 }
-                files_ext_info.append(file_ext_info)
-            
-            # 将文件扩展信息传递给客户端
-            current_transfer_ext_params['files_ext_info'] = files_ext_info
-            
-            # 使用第一个文件的公共参数作为基础参数
-            first_source_item = add_items_in_group[0]["source_item"]
-            if hasattr(first_source_item, 'file_ext') and first_source_item.file_ext:
-                file_ext = first_source_item.file_ext
-                if isinstance(file_ext, dict):
-                    # 只传递公共参数，不传递特定文件的参数
-                    common_params = {k: v for k, v in file_ext.items() 
-                                   if k not in ['share_fid_token']}
-                    current_transfer_ext_params.update(common_params)
-                    
-                    # 添加分享文件的父目录ID
-                    if first_source_item.parent_id:
-                        current_transfer_ext_params['share_parent_fid'] = first_source_item.parent_id
-            
-            # 如果source_definition有ext_params，也一并加入
-            if hasattr(source_definition, 'ext_params') and source_definition.ext_params:
-                if isinstance(source_definition.ext_params, dict):
-                    # 将source_definition.ext_params中的所有参数合并到current_transfer_ext_params
-                    current_transfer_ext_params.update(source_definition.ext_params)
-            
-            # 获取目标目录的file_id
-            target_dir_file_id = None
-            
-            # 1. 优先使用比较结果中的file_id（兼容字段）
-            if add_items_in_group:
-                target_dir_file_id = add_items_in_group[0].get("target_parent_file_id")
-            
-            # 2. 如果是根目录，使用target_definition中的file_id
-            if not target_dir_file_id and normalized_target_parent_dir == target_definition.file_path:
-                target_dir_file_id = target_definition.file_id
-            
-            if not target_dir_file_id:
-                error_msg = f"无法获取目标目录的file_id: {normalized_target_parent_dir}"
-                for add_item in add_items_in_group:
-                    source_item = add_item["source_item"]
-                    target_path = add_item.get("target_path", add_item.get("target_full_path", ""))
-                    operation_results['failed'].append(f"TRANSFER_ERROR: {source_item.file_path} -> {target_path} - {error_msg}")
-                continue
-            
-            # 构建transfer所需参数
-            try:
-                # 构建 TransferParam
-                transfer_params = TransferParam(
-                    drive_type=drive_type_str,
-                    source_type=source_definition.source_type,
-                    source_id=source_definition.source_id,
-                    source_path=source_definition.file_path,
-                    target_path=normalized_target_parent_dir,
-                    target_id=target_dir_file_id,  # 使用获取到的具体目录file_id
-                    file_ids=source_fs_ids_to_transfer,
-                    ext=current_transfer_ext_params
-                )
-                
-                # 使用统一架构的transfer方法（串行执行，等待完成）
-                transfer_success = await drive_manager.transfer_files(x_token, transfer_params)
-                
-                if transfer_success:
-                    # 转存成功，记录所有文件为成功
-                    for add_item in add_items_in_group:
-                        source_item = add_item["source_item"]
-                        target_path = add_item.get("target_path", add_item.get("target_full_path", ""))
-                        operation_results['succeeded'].append(f"TRANSFER_SUCCESS: {source_item.file_path} -> {target_path}")
-                else:
-                    # 转存失败，记录所有文件为失败
-                    for add_item in add_items_in_group:
-                        source_item = add_item["source_item"]
-                        target_path = add_item.get("target_path", add_item.get("target_full_path", ""))
-                        operation_results['failed'].append(f"TRANSFER_FAIL: {source_item.file_path} -> {target_path}")
-            except Exception as ex_transfer:
-                # 记录所有文件传输失败
-                for add_item in add_items_in_group:
-                    source_item = add_item["source_item"]
-                    target_path = add_item.get("target_path", add_item.get("target_full_path", ""))
-                    operation_results['failed'].append(f"TRANSFER_ERROR: {source_item.file_path} -> {target_path} - {str(ex_transfer)}")
-        except Exception as ex_group:
-            # 整组处理出错
-            for add_item in add_items_in_group:
-                source_item = add_item["source_item"]
-                target_path = add_item.get("target_path", add_item.get("target_full_path", ""))
-                operation_results['failed'].append(f"TRANSFER_GROUP_ERROR: {source_item.file_path} -> {target_path} - {str(ex_group)}")
-        
-        # 转存请求之间暂停2秒
-        import asyncio
-        await asyncio.sleep(2)
+                for source_item in source_items
+            ],
+            **{k: v for k, v in file_ext.items() if k != 'share_fid_token'},
+        }
+        
+        # 添加分享文件的父目录ID
+        if file_ext and first_source_item.parent_id:
+            current_transfer_ext_params['share_parent_fid'] = first_source_item.parent_id
+        
+        # source_definition 的 ext_params 也一并加入（schema 保证为 dict）
+        current_transfer_ext_params |= source_ext_params
+        
+        # 获取目标目录的file_id：优先使用比较结果中的file_id（兼容字段），根目录则回退到target_definition中的file_id
+        target_dir_file_id = add_items_in_group[0].get("target_parent_file_id") or (
+            target_root_id if normalized_target_parent_dir == target_root_path else None
+        )
+        
+        if not target_dir_file_id:
+            error_msg = f"无法获取目标目录的file_id: {normalized_target_parent_dir}"
+            failed.extend(_transfer_records(add_items_in_group, "TRANSFER_ERROR", error_msg))
+            continue
+        
+        # 构建 TransferParam（参数校验失败单独记录，不与网络错误混淆）；
+        # 替换的字段中只有目标路径带校验规则，在此直接检查
+        if transfer_template is None:
+            failed.extend(_transfer_records(add_items_in_group, "TRANSFER_PARAM_ERROR", template_error))
+            continue
+        if not normalized_target_parent_dir.startswith("/"):
+            failed.extend(_transfer_records(add_items_in_group, "TRANSFER_PARAM_ERROR", "目标路径必须以 '/' 开头"))
+            continue
+        transfer_params = transfer_template.model_copy(update={
+            "target_path": normalized_target_parent_dir,
+            "target_id": target_dir_file_id,  # 使用获取到的具体目录file_id
+            "file_ids": source_fs_ids_to_transfer,
+            "ext": current_transfer_ext_params
+        })
+        
+        transfer_batches.append((add_items_in_group, transfer_params))
+    
+    # 各目标父目录的转存串行执行；可重试的网络错误按指数退避重试，请求之间暂停2秒
+    transfer_results = await drive_manager.transfer_files_multi(
+        x_token,
+        [transfer_params for _, transfer_params in transfer_batches],
+        interval=2
+    )
+    for (add_items_in_group, _), (transfer_success, ex_transfer) in zip(transfer_batches, transfer_results):
+        if ex_transfer is not None:
+            # 记录所有文件传输失败
+            failed.extend(_transfer_records(add_items_in_group, "TRANSFER_ERROR", str(ex_transfer)))
+        elif transfer_success:
+            # 转存成功，记录所有文件为成功
+            succeeded.extend(_transfer_records(add_items_in_group, "TRANSFER_SUCCESS"))
+        else:
+            # 转存失败，记录所有文件为失败
+            failed.extend(_transfer_records(add_items_in_group, "TRANSFER_FAIL"))
     
     return operation_results
 
+def _coalesce_delete_subtrees(
+    to_delete: List[BaseFileInfo]
+) -> Tuple[List[BaseFileInfo], Dict[str, List[BaseFileInfo]]]:
+    """
+    合并待删除项中的子树：若某个文件夹本身在待删除列表中，其下的所有子项都会随之删除
+    
+    :param to_delete: 要删除的文件/目录列表
+    :return: (实际需要发起删除的项目列表, 文件夹路径到被其覆盖的子项列表的映射)
+    """
+    folder_paths = {item.file_path for item in to_delete if item.is_folder and item.file_path}
+    if not folder_paths:
+        return to_delete, {}
+    
+    remaining: List[BaseFileInfo] = []
+    covered_by_folder: Dict[str, List[BaseFileInfo]] = defaultdict(list)
+    for item in to_delete:
+        # 自下而上查找最顶层的待删除祖先目录
+        covering_folder = None
+        path = item.file_path
+        idx = path.rfind('/')
+        while idx > 0:
+            path = path[:idx]
+            if path in folder_paths:
+                covering_folder = path
+            idx = path.rfind('/')
+        
+        if covering_folder:
+            covered_by_folder[covering_folder].append(item)
+        else:
+            remaining.append(item)
+    
+    return remaining, covered_by_folder
+
 async def _process_delete_operations(
     drive_manager: Any,
     x_token: str,
     to_delete: List[BaseFileInfo],
     drive_type_str: str
-) -> Dict[str, List[str]]:
+) -> Dict[str, List[OperationRecord]]:
     """
     处理删除操作
     
@@ -1666,48 +2005,66 @@ async def _process_delete_operations(
     """
     operation_results = {'succeeded': [], 'failed': []}
     
-    # 按文件夹分组进行串行删除
+    # 子树合并：文件夹本身会被删除时，其下的子项随之删除，无需单独请求
+    to_delete, covered_by_folder = _coalesce_delete_subtrees(to_delete)
+    
+    # 按文件夹分组，每组再按批次大小拆分
     files_by_parent = defaultdict(list)
     for item in to_delete:
-        parent_path = os.path.dirname(item.file_path).replace("\\", "/")
+        parent_path = posixpath.dirname(item.file_path)
         files_by_parent[parent_path].append(item)
     
-    # 串行处理每个文件夹的删除操作
-    for parent_path, items_in_folder in files_by_parent.items():
-        file_paths = []
-        file_ids = []
-        
-        for item in items_in_folder:
-            if item.file_path:
-                # 确保路径是以/开头的绝对路径
-                path = item.file_path
-                if not path.startswith("/"):
-                    path = "/" + path
-                file_paths.append(path)
-            if item.file_id:
-                file_ids.append(item.file_id)
-        
-        # 构建 RemoveParam
-        try:
-            remove_params = RemoveParam(
-                drive_type=drive_type_str,
-                file_paths=file_paths,
-                file_ids=file_ids
-            )
+    # 预先解析网盘客户端，避免每次删除都经过 drive_manager 的分发
+    drive_client = drive_manager.get_client(x_token, drive_type_str)
+    
+    # 同一文件夹下的项目过多时拆分为多个批次，避免单次请求超出网盘接口限制
+    chunks = [
+        items_in_folder[i:i + _DELETE_CHUNK_SIZE]
+        for items_in_folder in files_by_parent.values()
+        for i in range(0, len(items_in_folder), _DELETE_CHUNK_SIZE)
+    ]
+    
+    # 串行处理每个批次（客户端请求是同步阻塞的，并发不会带来重叠），单个批次失败不影响其他批次
+    succeeded = operation_results['succeeded']
+    failed = operation_results['failed']
+    try:
+        for chunk_index, items_in_chunk in enumerate(chunks):
+            # 删除请求之间暂停1秒
+            if chunk_index:
+                await asyncio.sleep(1)
             
-            result = await drive_manager.remove_files(x_token, remove_params)
-            if result:
-                for item in items_in_folder:
-                    operation_results['succeeded'].append(f"DELETE_SUCCESS: {item.file_path} (ID: {item.file_id})")
-            else:
-                for item in items_in_folder:
-                    operation_results['failed'].append(f"DELETE_FAILED: {item.file_path} (ID: {item.file_id})")
-        except Exception as e:
-            for item in items_in_folder:
-                operation_results['failed'].append(f"DELETE_ERROR: {item.file_path} (ID: {item.file_id}) - {str(e)}")
-        
-        # 删除请求之间暂停1秒
-        import asyncio
-        await asyncio.sleep(1)
+            # 确保路径是以/开头的绝对路径（p[:1] 对空串同样安全）
+            file_paths = [
+                p if p[:1] == '/' else '/' + p
+                for p in (item.file_path for item in items_in_chunk)
+                if p
+            ]
+            file_ids = [item.file_id for item in items_in_chunk if item.file_id]
+            
+            # 被合并的子项与其所属文件夹共享删除结果
+            reported_items = list(items_in_chunk)
+            for item in items_in_chunk:
+                reported_items.extend(covered_by_folder.get(item.file_path, ()))
+            
+            # 构建 RemoveParam
+            try:
+                remove_params = RemoveParam(
+                    drive_type=drive_type_str,
+                    file_paths=file_paths,
+                    file_ids=file_ids
+                )
+                
+                result = await call_with_retry(drive_client.remove, remove_params, gate=drive_client.write_gate)
+                if result:
+                    for item in reported_items:
+                        succeeded.append(OperationRecord("DELETE_SUCCESS", item.file_path, file_id=item.file_id))
+                else:
+                    for item in reported_items:
+                        failed.append(OperationRecord("DELETE_FAILED", item.file_path, file_id=item.file_id))
+            except Exception as e:
+                for item in reported_items:
+                    failed.append(OperationRecord("DELETE_ERROR", item.file_path, file_id=item.file_id, detail=str(e)))
+    finally:
+        drive_client.mark_written()
     
     return operation_results 
\ No newline at end of file
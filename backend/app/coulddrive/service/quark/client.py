@@ -39,6 +39,7 @@ from backend.app.coulddrive.schema.user import (
 from backend.app.coulddrive.service.filesync_service import ItemFilter
 from backend.app.coulddrive.service.quark.api import QuarkApi
 from backend.app.coulddrive.service.quark.errors import QuarkApiError
+from backend.app.coulddrive.service.utils_service import is_retryable_error
 from backend.app.coulddrive.service.yp_service import BaseDriveClient
 from backend.common.log import log
 
@@ -326,7 +327,7 @@ class QuarkClient(BaseDriveClient):
                     
                     # 应用过滤器
                     if item_filter:
-                        cached_files = [item for item in cached_files if not item_filter.should_exclude(item)]
+                        cached_files = item_filter.filter_items(cached_files)
                     
                     return cached_files
                 else:
@@ -645,6 +646,9 @@ class QuarkClient(BaseDriveClient):
             return True
         except Exception as e:
             self.logger.error(f"删除文件时发生错误: {e}")
+            # 限流和网络错误交给调用方重试，删除可以安全地重复执行
+            if is_retryable_error(e):
+                raise
             return False
 
     async def create_share(self, file_ids: List[str], title: str, **kwargs) -> QuarkShare:
@@ -1192,6 +1196,9 @@ class QuarkClient(BaseDriveClient):
                     
             except Exception as e:
                 self.logger.error(f"链接分享转存时发生错误: {e}")
+                # 限流和网络错误交给调用方处理（限流可重试；网络错误时请求可能已送达，不能重试）
+                if is_retryable_error(e):
+                    raise
                 return False
 
         elif source_type in ["friend", "group"]:
@@ -8,8 +8,10 @@
 """
 
 # 标准库
+import asyncio
 from hashlib import md5
 import json
+import logging
 import math
 import string
 import time
@@ -19,7 +21,11 @@ import os
 import re
 from functools import partial
 from datetime import datetime
-from typing import Union, Optional, Any, Dict
+from typing import Union, Optional, Any, Awaitable, Callable, Dict
+
+import requests
+
+logger = logging.getLogger(__name__)
 
 # ==================== JSON处理函数 ====================
 
@@ -37,6 +43,100 @@ def dump_json(obj: Any) -> str:
     """
     return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
 
+# ==================== 重试处理函数 ====================
+
+# 网盘接口调用的重试配置：仅对连接失败、超时、限流等瞬时错误重试
+RETRYABLE_ERRORS = (ConnectionError, TimeoutError, requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+# 表示限流或服务端暂时不可用的 HTTP 状态码
+RETRYABLE_STATUS_CODES = frozenset({429, 502, 503, 504})
+# 网盘接口返回的限流错误码（百度：31034 命中接口频控、31219 请求数超出限额）
+RATE_LIMIT_ERROR_CODES = frozenset({31034, 31219})
+RETRY_MAX_ATTEMPTS = 3
+RETRY_BASE_DELAY = 1.0
+# 退避时间附加的随机抖动上限（秒），避免并发请求同时重试再次触发限流
+RETRY_JITTER = 0.2
+
+def is_retryable_error(error: BaseException) -> bool:
+    """
+    判断异常是否为可重试的瞬时错误
+    
+    连接失败、超时、HTTP 限流状态码以及网盘接口的限流错误码视为可重试；
+    API 客户端常把底层网络异常包装后抛出，因此会沿 __cause__ 链逐层检查
+    
+    参数:
+        error (BaseException): 捕获到的异常
+    
+    返回:
+        bool: 是否可重试
+    """
+    while error is not None:
+        if isinstance(error, RETRYABLE_ERRORS):
+            return True
+        if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+            if error.response.status_code in RETRYABLE_STATUS_CODES:
+                return True
+        if getattr(error, "error_code", None) in RATE_LIMIT_ERROR_CODES:
+            return True
+        error = error.__cause__
+    return False
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """
+    判断异常是否为限流拒绝（HTTP 429 或网盘接口的限流错误码）
+    
+    限流表示服务端没有执行该请求，因此即使是转存这类不能重复执行的写操作也可以安全重试；
+    超时或连接中断时请求可能已经送达服务端，不属于此类。同样会沿 __cause__ 链逐层检查
+    
+    参数:
+        error (BaseException): 捕获到的异常
+    
+    返回:
+        bool: 是否为限流错误
+    """
+    while error is not None:
+        if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+            if error.response.status_code == 429:
+                return True
+        if getattr(error, "error_code", None) in RATE_LIMIT_ERROR_CODES:
+            return True
+        error = error.__cause__
+    return False
+
+async def call_with_retry(
+    func: Callable[..., Awaitable[Any]],
+    *args: Any,
+    max_attempts: int = RETRY_MAX_ATTEMPTS,
+    base_delay: float = RETRY_BASE_DELAY,
+    retry_if: Callable[[BaseException], bool] = is_retryable_error,
+    gate: Optional[asyncio.Semaphore] = None,
+    **kwargs: Any
+) -> Any:
+    """
+    调用网盘接口，遇到可重试的瞬时错误时按指数退避重试，其余异常直接抛出
+    
+    参数:
+        func (Callable): 要调用的异步方法
+        max_attempts (int): 最大尝试次数
+        base_delay (float): 首次重试前的等待秒数，之后每次翻倍（另加少量随机抖动）
+        retry_if (Callable): 判断异常是否可重试，不能重复执行的操作（如转存）应传入 is_rate_limit_error
+        gate (asyncio.Semaphore): 并发闸门，只在每次实际调用期间持有，退避等待时释放
+    
+    返回:
+        Any: 接口返回值
+    """
+    for attempt in range(1, max_attempts + 1):
+        try:
+            if gate is None:
+                return await func(*args, **kwargs)
+            async with gate:
+                return await func(*args, **kwargs)
+        except Exception as e:
+            if attempt >= max_attempts or not retry_if(e):
+                raise
+            delay = base_delay * (2 ** (attempt - 1)) + random.uniform(0, RETRY_JITTER)
+            logger.warning(f"调用 {getattr(func, '__name__', func)} 失败（第 {attempt} 次），{delay:.1f} 秒后重试: {e}")
+            await asyncio.sleep(delay)
+
 # ==================== 文件大小处理函数 ====================
 
 def human_size(size: int) -> str:
@@ -9,13 +9,16 @@
 版本: 2.0.0
 """
 
+import asyncio
 import time
-from typing import Any, Dict, List, Optional, Union
+import weakref
+from typing import Any, Dict, List, Optional, Tuple, Union
 from datetime import datetime, timedelta
 
 from backend.app.coulddrive.schema.enum import RecursionSpeed, DriveType
 from backend.app.coulddrive.schema.file import BaseFileInfo, BaseShareInfo, MkdirParam, ListFilesParam, ListShareFilesParam, ListShareInfoParam, RemoveParam, TransferParam, RelationshipParam, UserInfoParam
 from backend.app.coulddrive.schema.user import BaseUserInfo, RelationshipItem
+from backend.app.coulddrive.service.utils_service import call_with_retry, is_rate_limit_error
 
 
 class BaseDriveClient:
@@ -25,6 +28,9 @@ class BaseDriveClient:
     具体的网盘客户端实现应该继承此类
     """
 
+    # 同一账号同时进行的写操作（建目录、转存、删除）上限，由并发执行的同步任务共享；子类可按网盘限流调整
+    WRITE_CONCURRENCY = 8
+
     def __init__(self, *args, **kwargs):
         """
         初始化网盘客户端基类
@@ -33,6 +39,10 @@ class BaseDriveClient:
         """
         self._is_authorized = False
         self._last_used = datetime.now()
+        self._write_gates: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._write_generation = 0
 
     @property
     def drive_type(self) -> str:
@@ -48,6 +58,30 @@ class BaseDriveClient:
         """更新最后使用时间"""
         self._last_used = datetime.now()
 
+    @property
+    def write_gate(self) -> asyncio.Semaphore:
+        """
+        账号级写操作并发闸门，客户端按账号缓存，因此同一账号的所有写操作共用
+        
+        缓存的客户端可能被不同线程里的事件循环共享（如各自 asyncio.run 的 celery 任务），
+        而 asyncio.Semaphore 只能在一个事件循环中使用，因此每个事件循环各建一个闸门。
+        闸门只在单次网盘写请求期间持有（经 call_with_retry 的 gate 参数），退避重试和请求之间的暂停都在闸门外进行
+        """
+        loop = asyncio.get_running_loop()
+        gate = self._write_gates.get(loop)
+        if gate is None:
+            gate = self._write_gates[loop] = asyncio.Semaphore(self.WRITE_CONCURRENCY)
+        return gate
+
+    @property
+    def write_generation(self) -> int:
+        """写操作计数，每次建目录、转存、删除等写操作后递增，用于判断基于此前列表的缓存是否失效"""
+        return self._write_generation
+
+    def mark_written(self) -> None:
+        """记录一次写操作（无论成功与否，网盘内容都可能已经改变）"""
+        self._write_generation += 1
+
     def login(self, *args: Any, **kwargs: Any) -> bool:
         """
         登录网盘
@@ -284,6 +318,9 @@ class BaseDrive:
     提供统一的网盘操作接口，自动管理客户端实例的创建、缓存和清理
     """
     
+    # 会改变网盘内容的客户端方法，经 call_method 调用后记录到客户端的写操作计数
+    WRITE_METHODS = frozenset({"mkdir", "remove", "transfer", "move", "rename", "copy"})
+    
     def __init__(self, cleanup_interval: int = 3600):
         """
         初始化智能网盘管理器
@@ -421,16 +458,13 @@ class BaseDrive:
             log.error(f"创建 Alist 网盘客户端失败: {e}", exc_info=True)
             return None
     
-    async def call_method(self, x_token: str, drive_type: Union[str, DriveType], method_name: str, params: Any, **kwargs) -> Any:
+    def get_client(self, x_token: str, drive_type: Union[str, DriveType]) -> BaseDriveClient:
         """
-        统一的方法调用接口
+        解析并返回网盘客户端，供需要在循环中多次调用同一客户端的场景预先获取
         
         :param x_token: 认证令牌
         :param drive_type: 网盘类型（字符串或枚举）
-        :param method_name: 要调用的方法名
-        :param params: 参数对象
-        :param kwargs: 额外的关键字参数
-        :return: 方法调用结果
+        :return: 网盘客户端实例
         """
         # 如果是枚举类型，转换为字符串
         if isinstance(drive_type, DriveType):
@@ -447,6 +481,21 @@ class BaseDrive:
         if not client:
             raise ValueError(f"无法创建网盘客户端: {drive_type}")
         
+        return client
+    
+    async def call_method(self, x_token: str, drive_type: Union[str, DriveType], method_name: str, params: Any, **kwargs) -> Any:
+        """
+        统一的方法调用接口
+        
+        :param x_token: 认证令牌
+        :param drive_type: 网盘类型（字符串或枚举）
+        :param method_name: 要调用的方法名
+        :param params: 参数对象
+        :param kwargs: 额外的关键字参数
+        :return: 方法调用结果
+        """
+        client = self.get_client(x_token, drive_type)
+        
         # 检查方法是否存在
         if not hasattr(client, method_name):
             raise AttributeError(f"客户端不支持方法: {method_name}")
@@ -454,7 +503,12 @@ class BaseDrive:
         method = getattr(client, method_name)
         
         # 统一调用，让具体客户端自己处理参数
-        return await method(params, **kwargs)
+        if method_name not in self.WRITE_METHODS:
+            return await method(params, **kwargs)
+        try:
+            return await method(params, **kwargs)
+        finally:
+            client.mark_written()
     
     # 便捷方法
     async def get_disk_list(self, x_token: str, params: 'ListFilesParam', **kwargs) -> List[BaseFileInfo]:
@@ -481,6 +535,38 @@ class BaseDrive:
         """创建文件夹"""
         return await self.call_method(x_token, params.drive_type, "mkdir", params, **kwargs)
     
+    async def create_mkdirs(
+        self, x_token: str, params_list: List['MkdirParam'], **kwargs
+    ) -> List[Tuple[str, Optional[BaseFileInfo], Optional[Exception]]]:
+        """
+        批量创建文件夹
+        
+        各网盘均无原生批量创建接口，这里只解析一次客户端，再逐个串行调用 mkdir；
+        客户端的 HTTP 请求是同步阻塞的，并发调用并不会让请求重叠，只会打乱请求节奏。
+        可重试的瞬时错误（含限流）按指数退避重试
+        
+        :param x_token: 认证令牌
+        :param params_list: 创建文件夹参数列表（同一网盘类型）
+        :param kwargs: 额外的关键字参数
+        :return: 与 params_list 一一对应的 (路径, 目录信息, 异常) 列表
+        """
+        if not params_list:
+            return []
+        
+        client = self.get_client(x_token, params_list[0].drive_type)
+        results: List[Tuple[str, Optional[BaseFileInfo], Optional[Exception]]] = []
+        try:
+            for params in params_list:
+                # 单个目录的失败单独记录，不影响其余目录的创建
+                try:
+                    dir_info = await call_with_retry(client.mkdir, params, gate=client.write_gate, **kwargs)
+                    results.append((params.file_path, dir_info, None))
+                except Exception as e:
+                    results.append((params.file_path, None, e))
+        finally:
+            client.mark_written()
+        return results
+    
     async def remove_files(self, x_token: str, params: 'RemoveParam', **kwargs) -> bool:
         """删除文件"""
         return await self.call_method(x_token, params.drive_type, "remove", params, **kwargs)
@@ -489,6 +575,48 @@ class BaseDrive:
         """转存文件"""
         return await self.call_method(x_token, params.drive_type, "transfer", params, **kwargs)
     
+    async def transfer_files_multi(
+        self,
+        x_token: str,
+        params_list: List['TransferParam'],
+        interval: float = 0.0,
+        **kwargs
+    ) -> List[Tuple[Optional[bool], Optional[Exception]]]:
+        """
+        批量转存文件，每个 TransferParam 对应一个目标目录
+        
+        各网盘的转存接口一次只能写入一个目标目录，这里只解析一次客户端，再逐个串行调用 transfer；
+        客户端的 HTTP 请求是同步阻塞的，串行执行才能保证两次请求之间的间隔不被并发压缩。
+        可重试的瞬时错误（含限流）按指数退避重试
+        
+        :param x_token: 认证令牌
+        :param params_list: 转存参数列表（同一网盘类型）
+        :param interval: 相邻两次转存请求之间暂停的秒数，用于规避限流
+        :param kwargs: 额外的关键字参数
+        :return: 与 params_list 一一对应的 (转存结果, 异常) 列表
+        """
+        if not params_list:
+            return []
+        
+        client = self.get_client(x_token, params_list[0].drive_type)
+        results: List[Tuple[Optional[bool], Optional[Exception]]] = []
+        try:
+            for index, params in enumerate(params_list):
+                if index and interval:
+                    await asyncio.sleep(interval)
+                # 单个目录的失败单独记录，不影响其余目录的转存
+                try:
+                    # 转存不能重复执行：超时或连接中断时请求可能已送达（ondup=newcopy 会产生重复副本），只在限流时重试
+                    result = await call_with_retry(
+                        client.transfer, params, retry_if=is_rate_limit_error, gate=client.write_gate, **kwargs
+                    )
+                    results.append((result, None))
+                except Exception as e:
+                    results.append((None, e))
+        finally:
+            client.mark_written()
+        return results
+    
     async def get_relationship_list(self, x_token: str, params: 'RelationshipParam', **kwargs) -> List[RelationshipItem]:
         """获取关系列表（好友或群组）"""
         return await self.call_method(x_token, params.drive_type, "get_relationship_list", params, **kwargs)
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import asyncio
+
+import pytest
+
+from backend.app.coulddrive.tests.utils.drive import FakeDriveClient, FakeDriveManager
+
+
+@pytest.fixture
+def sleeps(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    """替换 asyncio.sleep：不真正等待，只按顺序记录请求之间的暂停时长"""
+    recorded: list[float] = []
+    real_sleep = asyncio.sleep
+
+    async def fake_sleep(delay: float, *args, **kwargs) -> None:
+        recorded.append(delay)
+        await real_sleep(0)
+
+    monkeypatch.setattr(asyncio, 'sleep', fake_sleep)
+    return recorded
+
+
+@pytest.fixture
+def drive_client() -> FakeDriveClient:
+    return FakeDriveClient()
+
+
+@pytest.fixture
+def drive_manager(drive_client: FakeDriveClient) -> FakeDriveManager:
+    return FakeDriveManager(drive_client)
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import asyncio
+import json
+
+import pytest
+import requests
+
+from backend.app.coulddrive.schema.file import BaseFileInfo, TransferParam
+from backend.app.coulddrive.service import filesync_service
+from backend.app.coulddrive.service.baidu.client import BaiduClient
+from backend.app.coulddrive.service.yp_service import BaseDrive
+from backend.app.coulddrive.tests.utils.drive import FakeDriveManager
+
+_DELETED_FILE = BaseFileInfo(file_id='fs:1', file_name='a.txt', file_path='/dst/a.txt', is_folder=False, file_size=1)
+
+
+def _response(payload: dict) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response._content = json.dumps(payload).encode()
+    return response
+
+
+def _client(monkeypatch: pytest.MonkeyPatch, replies: list[dict | Exception]) -> tuple[BaiduClient, list[str]]:
+    """创建不访问网络的百度客户端，HTTP 请求按顺序返回 replies 中的响应或抛出其中的异常"""
+
+    async def create() -> BaiduClient:
+        # 在事件循环中创建时不会立即请求用户信息验证登录
+        return BaiduClient('BDUSS=bduss; STOKEN=stoken', user_id=1)
+
+    client = asyncio.run(create())
+    client._baidupcs._bdstoken = '0' * 32
+    urls: list[str] = []
+
+    def request(method: str, url: str, **kwargs) -> requests.Response:
+        urls.append(url)
+        reply = replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return _response(reply)
+
+    monkeypatch.setattr(client._baidupcs._session, 'request', request)
+    return client, urls
+
+
+def _transfer_param(target_path: str) -> TransferParam:
+    return TransferParam(
+        drive_type='BaiduDrive',
+        source_type='friend',
+        source_id='1001',
+        source_path='/src',
+        target_path=target_path,
+        file_ids=['11'],
+        ext={'msg_id': '42'},
+    )
+
+
+@pytest.mark.parametrize('errno', [31034, 31219])
+def test_remove_retries_rate_limited_response(monkeypatch: pytest.MonkeyPatch, sleeps: list[float], errno: int) -> None:
+    client, urls = _client(monkeypatch, [{'errno': errno}, {'errno': 0}])
+
+    results = asyncio.run(
+        filesync_service._process_delete_operations(FakeDriveManager(client), 'token', [_DELETED_FILE], 'BaiduDrive')
+    )
+
+    assert len(urls) == 2
+    assert len(sleeps) == 1
+    assert [r.src_path for r in results['succeeded']] == ['/dst/a.txt']
+    assert results['failed'] == []
+
+
+def test_remove_retries_transport_errors(monkeypatch: pytest.MonkeyPatch, sleeps: list[float]) -> None:
+    client, urls = _client(monkeypatch, [requests.exceptions.ConnectionError('reset'), {'errno': 0}])
+
+    results = asyncio.run(
+        filesync_service._process_delete_operations(FakeDriveManager(client), 'token', [_DELETED_FILE], 'BaiduDrive')
+    )
+
+    assert len(urls) == 2
+    assert [r.src_path for r in results['succeeded']] == ['/dst/a.txt']
+
+
+def _transfer(monkeypatch: pytest.MonkeyPatch, client: BaiduClient, target_path: str) -> list:
+    drive = BaseDrive()
+    monkeypatch.setattr(drive, 'get_client', lambda x_token, drive_type: client)
+    return asyncio.run(drive.transfer_files_multi('token', [_transfer_param(target_path)]))
+
+
+def test_transfer_retries_rate_limited_response(monkeypatch: pytest.MonkeyPatch, sleeps: list[float]) -> None:
+    client, urls = _client(monkeypatch, [{'errno': 31034}, {'errno': 0}])
+
+    assert _transfer(monkeypatch, client, '/dst') == [(True, None)]
+    assert len(urls) == 2
+    assert len(sleeps) == 1
+
+
+def test_transfer_does_not_retry_transport_errors(monkeypatch: pytest.MonkeyPatch, sleeps: list[float]) -> None:
+    # 请求可能已送达服务端，ondup=newcopy 时重试会产生重复副本
+    client, urls = _client(monkeypatch, [requests.exceptions.ReadTimeout('timeout'), {'errno': 0}])
+
+    [(result, error)] = _transfer(monkeypatch, client, '/dst')
+
+    assert result is None
+    assert isinstance(error.__cause__, requests.exceptions.ReadTimeout)
+    assert len(urls) == 1
+    assert sleeps == []
+
+
+def test_transfer_fails_fast_on_other_errors(monkeypatch: pytest.MonkeyPatch, sleeps: list[float]) -> None:
+    client, urls = _client(monkeypatch, [{'errno': -9}])
+
+    assert _transfer(monkeypatch, client, '/dst') == [(False, None)]
+    assert len(urls) == 1
+    assert sleeps == []
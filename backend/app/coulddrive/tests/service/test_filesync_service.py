@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import asyncio
+
+from collections import OrderedDict
+
+import pytest
+
+from backend.app.coulddrive.schema.enum import ItemType, MatchMode, MatchTarget, RecursionSpeed
+from backend.app.coulddrive.schema.file import BaseFileInfo, ShareSourceDefinition
+from backend.app.coulddrive.service import filesync_service
+from backend.app.coulddrive.service.filesync_service import ExclusionRule, ItemFilter, RenameRule
+from backend.app.coulddrive.tests.utils.drive import FakeDriveClient, FakeDriveManager
+
+
+def _file(file_path: str, is_folder: bool = False, file_size: int | None = 1) -> BaseFileInfo:
+    return BaseFileInfo(
+        file_id=f'id:{file_path}',
+        file_name=file_path.rsplit('/', 1)[-1],
+        file_path=file_path,
+        is_folder=is_folder,
+        file_size=None if is_folder else file_size,
+    )
+
+
+def test_process_delete_operations_runs_batches_serially(
+    monkeypatch: pytest.MonkeyPatch,
+    drive_manager: FakeDriveManager,
+    drive_client: FakeDriveClient,
+    sleeps: list[float],
+) -> None:
+    monkeypatch.setattr(filesync_service, '_DELETE_CHUNK_SIZE', 2)
+    drive_client.errors['/dst/x2'] = RuntimeError('remove failed')
+    items = [_file(f'/dst/x{i}') for i in range(5)]
+
+    results = asyncio.run(filesync_service._process_delete_operations(drive_manager, 'token', items, 'QuarkDrive'))
+
+    assert drive_client.calls == [
+        ('remove', ('/dst/x0', '/dst/x1')),
+        ('remove', ('/dst/x2', '/dst/x3')),
+        ('remove', ('/dst/x4',)),
+    ]
+    # 删除请求之间暂停1秒，最后一批之后不再等待
+    assert sleeps == [1, 1]
+    assert [r.src_path for r in results['succeeded']] == ['/dst/x0', '/dst/x1', '/dst/x4']
+    assert [(r.status, r.src_path, r.detail) for r in results['failed']] == [
+        ('DELETE_ERROR', '/dst/x2', 'remove failed'),
+        ('DELETE_ERROR', '/dst/x3', 'remove failed'),
+    ]
+    assert drive_client.write_generation == 1
+
+
+def test_process_delete_operations_chunks_per_parent_folder(
+    monkeypatch: pytest.MonkeyPatch,
+    drive_manager: FakeDriveManager,
+    drive_client: FakeDriveClient,
+    sleeps: list[float],
+) -> None:
+    monkeypatch.setattr(filesync_service, '_DELETE_CHUNK_SIZE', 2)
+    items = [_file('/dst/a/1'), _file('/dst/b/rejected'), _file('/dst/a/2'), _file('/dst/a/3'), _file('/dst/b/4')]
+
+    results = asyncio.run(filesync_service._process_delete_operations(drive_manager, 'token', items, 'QuarkDrive'))
+
+    # 每个批次只包含同一文件夹下的项目，路径与 ID 一一对应
+    assert drive_client.calls == [
+        ('remove', ('/dst/a/1', '/dst/a/2')),
+        ('remove', ('/dst/a/3',)),
+        ('remove', ('/dst/b/rejected', '/dst/b/4')),
+    ]
+    assert drive_client.removed_ids == [
+        ['id:/dst/a/1', 'id:/dst/a/2'],
+        ['id:/dst/a/3'],
+        ['id:/dst/b/rejected', 'id:/dst/b/4'],
+    ]
+    # 接口返回失败只影响该批次
+    assert [r.src_path for r in results['succeeded']] == ['/dst/a/1', '/dst/a/2', '/dst/a/3']
+    assert [(r.status, r.src_path) for r in results['failed']] == [
+        ('DELETE_FAILED', '/dst/b/rejected'),
+        ('DELETE_FAILED', '/dst/b/4'),
+    ]
+
+
+@pytest.mark.parametrize('mode', ['incremental', 'full', 'overwrite'])
+def test_compare_drive_lists_deduplicates_source_paths(mode: str) -> None:
+    # 'src/a.txt' 与 '/src/a.txt' 的相对路径相同，只保留最后一个条目
+    first = _file('src/a.txt', file_size=1)
+    last = _file('/src/a.txt', file_size=2)
+
+    result = filesync_service.compare_drive_lists([first, last], [], mode, None, '/src', '/dst')
+
+    assert [(add['source_item'], add['target_path']) for add in result['to_add']] == [(last, '/dst/a.txt')]
+
+
+def test_compare_drive_lists_full_mode_deletes_in_target_order() -> None:
+    source = [_file('/src/keep.txt')]
+    target = [_file(f'/dst/{name}') for name in ('z.txt', 'keep.txt', 'm.txt', 'a.txt', 'b')]
+
+    result = filesync_service.compare_drive_lists(source, target, 'full', None, '/src', '/dst')
+
+    assert [item.file_path for item in result['to_delete_from_target']] == [
+        '/dst/z.txt',
+        '/dst/m.txt',
+        '/dst/a.txt',
+        '/dst/b',
+    ]
+
+
+def _kept_paths(rules: list[ExclusionRule], items: list[BaseFileInfo]) -> list[str]:
+    item_filter = ItemFilter(rules)
+    kept = item_filter.filter_items(items)
+    # 批量过滤与逐项判断、逐条规则判断的结果必须一致
+    assert kept == [item for item in items if not item_filter.should_exclude(item)]
+    assert kept == [item for item in items if not any(rule.matches(item) for rule in rules)]
+    return [item.file_path for item in kept]
+
+
+def test_item_filter_respects_item_type() -> None:
+    rules = [
+        ExclusionRule('tmp', item_type=ItemType.FOLDER),
+        ExclusionRule('bak', item_type=ItemType.FILE),
+        ExclusionRule('log', target=MatchTarget.EXTENSION, mode=MatchMode.EXACT),
+    ]
+    items = [
+        _file('/src/tmp', is_folder=True),
+        _file('/src/tmp.txt'),
+        _file('/src/bak', is_folder=True),
+        _file('/src/a.bak'),
+        _file('/src/log', is_folder=True),
+        _file('/src/app.log'),
+        _file('/src/app.LOG'),
+    ]
+
+    # 文件夹规则不影响文件，文件规则不影响文件夹，扩展名规则不匹配文件夹
+    assert _kept_paths(rules, items) == ['/src/tmp.txt', '/src/bak', '/src/log']
+
+
+def test_item_filter_any_matching_rule_excludes() -> None:
+    rules = [
+        ExclusionRule('readme.md', mode=MatchMode.EXACT),
+        ExclusionRule('secret', target=MatchTarget.PATH),
+        ExclusionRule('Draft', case_sensitive=True),
+    ]
+    items = [
+        _file('/src/README.md'),
+        _file('/src/readme.md.bak'),
+        _file('/src/secret/a.txt'),
+        _file('/src/Draft.txt'),
+        _file('/src/draft.txt'),
+    ]
+
+    assert _kept_paths(rules, items) == ['/src/readme.md.bak', '/src/draft.txt']
+
+
+def test_item_filter_wildcard_rules() -> None:
+    rules = [
+        ExclusionRule('*.log', mode=MatchMode.WILDCARD),
+        ExclusionRule('[ab]?.txt', mode=MatchMode.WILDCARD),
+        ExclusionRule('/src/cache/*', target=MatchTarget.PATH, mode=MatchMode.WILDCARD),
+    ]
+    items = [
+        _file('/src/app.LOG'),
+        _file('/src/app.log.bak'),
+        _file('/src/a1.txt'),
+        _file('/src/c1.txt'),
+        _file('/src/cache/x.bin'),
+        _file('/src/cache', is_folder=True),
+    ]
+
+    # 通配符保持子串匹配语义，"*.log" 同样排除 "app.log.bak"
+    assert _kept_paths(rules, items) == ['/src/c1.txt', '/src/cache']
+
+
+def test_item_filter_regex_rules() -> None:
+    rules = [
+        ExclusionRule(r'^\d+\.tmp$', mode=MatchMode.REGEX),
+        # 含捕获组的规则不能合并进联合正则（反向引用编号会错位），需要单独匹配
+        ExclusionRule(r'^(\w)\1', mode=MatchMode.REGEX),
+        ExclusionRule(r'(?i)^~\$', mode=MatchMode.REGEX, case_sensitive=True),
+    ]
+    items = [
+        _file('/src/123.tmp'),
+        _file('/src/a123.tmp'),
+        _file('/src/aa.txt'),
+        _file('/src/ab.txt'),
+        _file('/src/~$Doc.docx'),
+    ]
+
+    assert _kept_paths(rules, items) == ['/src/a123.tmp', '/src/ab.txt']
+
+
+def test_item_filter_rebuilds_buckets_after_add_rule() -> None:
+    item_filter = ItemFilter([ExclusionRule('a.txt', mode=MatchMode.EXACT)])
+    items = [_file('/src/a.txt'), _file('/src/b.txt')]
+    assert item_filter.filter_items(items) == [items[1]]
+
+    item_filter.add_rule(ExclusionRule('b.txt', mode=MatchMode.EXACT))
+
+    assert item_filter.filter_items(items) == []
+
+
+def test_exclusion_rule_rejects_invalid_regex() -> None:
+    with pytest.raises(ValueError):
+        ExclusionRule('[unclosed', mode=MatchMode.REGEX)
+
+
+def test_coalesce_delete_subtrees_keeps_topmost_folder() -> None:
+    items = [
+        _file('/dst/a/b/c.txt'),
+        _file('/dst/a', is_folder=True),
+        _file('/dst/a/b', is_folder=True),
+        # 与 /dst/a 共享字符串前缀但不在其目录下
+        _file('/dst/ab.txt'),
+        _file('/dst/x/y.txt'),
+    ]
+
+    remaining, covered_by_folder = filesync_service._coalesce_delete_subtrees(items)
+
+    assert [item.file_path for item in remaining] == ['/dst/a', '/dst/ab.txt', '/dst/x/y.txt']
+    assert {folder: [item.file_path for item in covered] for folder, covered in covered_by_folder.items()} == {
+        '/dst/a': ['/dst/a/b/c.txt', '/dst/a/b'],
+    }
+
+
+def test_coalesce_delete_subtrees_without_folders() -> None:
+    items = [_file('/dst/a.txt'), _file('/dst/b.txt')]
+
+    assert filesync_service._coalesce_delete_subtrees(items) == (items, {})
+
+
+def test_process_delete_operations_reports_coalesced_items(
+    drive_manager: FakeDriveManager, drive_client: FakeDriveClient, sleeps: list[float]
+) -> None:
+    items = [_file('/dst/a', is_folder=True), _file('/dst/a/b.txt'), _file('/dst/a/c', is_folder=True)]
+
+    results = asyncio.run(filesync_service._process_delete_operations(drive_manager, 'token', items, 'QuarkDrive'))
+
+    # 只删除最顶层的文件夹，被覆盖的子项共享其删除结果
+    assert drive_client.calls == [('remove', ('/dst/a',))]
+    assert [r.src_path for r in results['succeeded']] == ['/dst/a', '/dst/a/b.txt', '/dst/a/c']
+    assert results['failed'] == []
+
+
+def _renames(result: dict) -> list[tuple[str, str, str]]:
+    return [
+        (rename['target_item'].file_path, rename['suggested_new_path'], rename['applied_rule_pattern'])
+        for rename in result['to_rename_in_target']
+    ]
+
+
+def test_compare_drive_lists_rename_uses_first_matching_target() -> None:
+    # 两个目标条目都能按规则重命名为同一个源路径时，按目标列表顺序取第一个
+    source = [_file('/data/new.txt')]
+    target = [_file('/data/old2.txt'), _file('/data/old1.txt')]
+
+    result = filesync_service.compare_drive_lists(
+        source, target, 'full', [RenameRule(r'old\d', 'new')], '/data', '/data'
+    )
+
+    assert _renames(result) == [('/data/old2.txt', '/data/new.txt', r'old\d')]
+    assert result['to_add'] == []
+    assert [item.file_path for item in result['to_delete_from_target']] == ['/data/old1.txt']
+
+
+def test_compare_drive_lists_rename_uses_first_matching_rule() -> None:
+    source = [_file('/data/new.txt')]
+    target = [_file('/data/old.txt')]
+    rules = [RenameRule('^old', 'new'), RenameRule('old', 'new')]
+
+    result = filesync_service.compare_drive_lists(source, target, 'incremental', rules, '/data', '/data')
+
+    assert _renames(result) == [('/data/old.txt', '/data/new.txt', '^old')]
+
+
+def test_compare_drive_lists_rename_skips_incompatible_and_used_targets() -> None:
+    source = [_file('/data/new.txt', file_size=2), _file('/data/fresh.txt', file_size=2)]
+    target = [
+        # 大小不同，不能作为重命名候选
+        _file('/data/old.txt', file_size=1),
+        _file('/data/old_copy.txt', file_size=2),
+    ]
+    rules = [RenameRule('^old(_copy)?', 'new'), RenameRule('^old_copy', 'fresh')]
+
+    result = filesync_service.compare_drive_lists(source, target, 'incremental', rules, '/data', '/data')
+
+    # old_copy.txt 已被 new.txt 占用，fresh.txt 只能作为新增项
+    assert _renames(result) == [('/data/old_copy.txt', '/data/new.txt', '^old(_copy)?')]
+    assert [add['source_item'].file_path for add in result['to_add']] == ['/data/fresh.txt']
+
+
+@pytest.fixture
+def listing_cache(monkeypatch: pytest.MonkeyPatch) -> OrderedDict:
+    cache: OrderedDict = OrderedDict()
+    monkeypatch.setattr(filesync_service, '_listing_cache', cache)
+    return cache
+
+
+def _list_source(drive_manager: FakeDriveManager, source_path: str = '/share', force_refresh: bool = False) -> list:
+    definition = ShareSourceDefinition(file_path=source_path, source_type='friend', source_id='1001')
+    items, _ = asyncio.run(
+        filesync_service._get_list_for_compare_op(
+            drive_manager, 'token', True, definition, True, RecursionSpeed.NORMAL, None, 'QuarkDrive', force_refresh
+        )
+    )
+    return items
+
+
+def test_source_listing_cache_hit_and_force_refresh(
+    listing_cache: OrderedDict, drive_manager: FakeDriveManager, drive_client: FakeDriveClient
+) -> None:
+    drive_manager.share_items = [_file('/share/a.txt')]
+
+    assert _list_source(drive_manager) == _list_source(drive_manager) == drive_manager.share_items
+    assert drive_manager.share_list_calls == 1
+
+    drive_manager.share_items = [_file('/share/a.txt'), _file('/share/b.txt')]
+    # 强制刷新时不读缓存，并用新列表覆盖缓存
+    assert len(_list_source(drive_manager, force_refresh=True)) == 2
+    assert len(_list_source(drive_manager)) == 2
+    assert drive_manager.share_list_calls == 2
+
+    # 账号发生写操作后缓存失效
+    drive_client.mark_written()
+    _list_source(drive_manager)
+    assert drive_manager.share_list_calls == 3
+
+
+def test_source_listing_cache_purges_expired_entries(
+    monkeypatch: pytest.MonkeyPatch, listing_cache: OrderedDict, drive_manager: FakeDriveManager
+) -> None:
+    now = [1000.0]
+    monkeypatch.setattr(filesync_service.time, 'monotonic', lambda: now[0])
+
+    _list_source(drive_manager, '/share/old')
+    now[0] += filesync_service._LISTING_CACHE_TTL
+    _list_source(drive_manager, '/share/new')
+
+    # 过期条目在写入新条目时被清理，而不是等到被挤出
+    assert [key[3] for key in listing_cache] == ['/share/new']
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import asyncio
+
+import pytest
+import requests
+
+from backend.app.coulddrive.service import utils_service
+from backend.app.coulddrive.service.baidu.errors import BaiduApiError
+from backend.app.coulddrive.service.utils_service import call_with_retry, is_rate_limit_error, is_retryable_error
+
+
+def _http_error(status_code: int) -> requests.exceptions.HTTPError:
+    response = requests.Response()
+    response.status_code = status_code
+    return requests.exceptions.HTTPError(f'{status_code} error', response=response)
+
+
+def _raised_from(error: BaseException, cause: BaseException) -> BaseException:
+    error.__cause__ = cause
+    return error
+
+
+@pytest.mark.parametrize(
+    'error',
+    [
+        ConnectionError('reset'),
+        TimeoutError('timeout'),
+        requests.exceptions.ConnectionError('reset'),
+        requests.exceptions.ReadTimeout('timeout'),
+        _http_error(429),
+        _http_error(503),
+        BaiduApiError('error_code: 31034', error_code=31034),
+        BaiduApiError('error_code: 31219', error_code=31219),
+        # API 客户端把底层网络异常包装后抛出
+        BaiduApiError('request failed', cause=requests.exceptions.ConnectionError('reset')),
+        _raised_from(RuntimeError('outer'), BaiduApiError('inner', cause=TimeoutError('timeout'))),
+    ],
+)
+def test_is_retryable_error(error: BaseException) -> None:
+    assert is_retryable_error(error)
+
+
+@pytest.mark.parametrize(
+    'error',
+    [
+        ValueError('bad param'),
+        KeyError('file_id'),
+        _http_error(400),
+        _http_error(404),
+        requests.exceptions.HTTPError('no response'),
+        BaiduApiError('error_code: -9', error_code=-9),
+        BaiduApiError('file not found', cause=ValueError('bad param')),
+        _raised_from(RuntimeError('outer'), _http_error(403)),
+    ],
+)
+def test_is_not_retryable_error(error: BaseException) -> None:
+    assert not is_retryable_error(error)
+
+
+@pytest.mark.parametrize(
+    ('error', 'expected'),
+    [
+        (_http_error(429), True),
+        (BaiduApiError('error_code: 31219', error_code=31219), True),
+        (_raised_from(RuntimeError('outer'), BaiduApiError('inner', error_code=31034)), True),
+        # 请求可能已送达服务端，不视为限流
+        (requests.exceptions.ReadTimeout('timeout'), False),
+        (BaiduApiError('request failed', cause=requests.exceptions.ConnectionError('reset')), False),
+        (_http_error(503), False),
+    ],
+)
+def test_is_rate_limit_error(error: BaseException, expected: bool) -> None:
+    assert is_rate_limit_error(error) is expected
+
+
+def _flaky(errors: list[BaseException], calls: list[int]):
+    async def func(value: str) -> str:
+        calls.append(len(calls) + 1)
+        if errors:
+            raise errors.pop(0)
+        return value
+
+    return func
+
+
+def test_call_with_retry_backs_off_on_retryable_errors(monkeypatch: pytest.MonkeyPatch, sleeps: list[float]) -> None:
+    monkeypatch.setattr(utils_service, 'RETRY_JITTER', 0)
+    calls: list[int] = []
+    func = _flaky([BaiduApiError('busy', error_code=31034), requests.exceptions.Timeout('timeout')], calls)
+
+    assert asyncio.run(call_with_retry(func, 'ok', base_delay=0.5)) == 'ok'
+    assert calls == [1, 2, 3]
+    assert sleeps == [0.5, 1.0]
+
+
+def test_call_with_retry_raises_terminal_errors_immediately(sleeps: list[float]) -> None:
+    calls: list[int] = []
+    func = _flaky([ValueError('bad param')], calls)
+
+    with pytest.raises(ValueError):
+        asyncio.run(call_with_retry(func, 'ok'))
+    assert calls == [1]
+    assert sleeps == []
+
+
+def test_call_with_retry_gives_up_after_max_attempts(sleeps: list[float]) -> None:
+    calls: list[int] = []
+    func = _flaky([TimeoutError('timeout') for _ in range(3)], calls)
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(call_with_retry(func, 'ok', max_attempts=3))
+    assert calls == [1, 2, 3]
+    assert len(sleeps) == 2
+
+
+def test_call_with_retry_uses_retry_if(sleeps: list[float]) -> None:
+    calls: list[int] = []
+    func = _flaky([TimeoutError('timeout')], calls)
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(call_with_retry(func, 'ok', retry_if=is_rate_limit_error))
+    assert calls == [1]
+    assert sleeps == []
+
+
+def test_call_with_retry_releases_gate_during_backoff(monkeypatch: pytest.MonkeyPatch) -> None:
+    locked_states: list[tuple[str, bool]] = []
+
+    async def run() -> str:
+        gate = asyncio.Semaphore(1)
+        errors = [TimeoutError('timeout')]
+
+        async def func() -> str:
+            locked_states.append(('call', gate.locked()))
+            if errors:
+                raise errors.pop(0)
+            return 'ok'
+
+        async def fake_sleep(delay: float) -> None:
+            locked_states.append(('sleep', gate.locked()))
+
+        monkeypatch.setattr(asyncio, 'sleep', fake_sleep)
+        return await call_with_retry(func, gate=gate)
+
+    assert asyncio.run(run()) == 'ok'
+    # 闸门只在实际调用期间持有，退避等待时已经释放
+    assert locked_states == [('call', True), ('sleep', False), ('call', True)]
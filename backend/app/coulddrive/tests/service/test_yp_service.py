@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import asyncio
+
+import pytest
+import requests
+
+from backend.app.coulddrive.schema.file import MkdirParam, TransferParam
+from backend.app.coulddrive.service.baidu.errors import BaiduApiError
+from backend.app.coulddrive.service.yp_service import BaseDrive
+from backend.app.coulddrive.tests.utils.drive import FakeDriveClient
+
+
+@pytest.fixture
+def drive(monkeypatch: pytest.MonkeyPatch, drive_client: FakeDriveClient) -> BaseDrive:
+    drive = BaseDrive()
+    monkeypatch.setattr(drive, 'get_client', lambda x_token, drive_type: drive_client)
+    return drive
+
+
+def _mkdir_param(file_path: str) -> MkdirParam:
+    return MkdirParam(
+        drive_type='QuarkDrive', file_path=file_path, parent_id='root', file_name=file_path.rsplit('/', 1)[-1]
+    )
+
+
+def _transfer_param(target_path: str) -> TransferParam:
+    return TransferParam(
+        drive_type='QuarkDrive',
+        source_type='link',
+        source_id='share',
+        source_path='/src',
+        target_path=target_path,
+        target_id='root',
+        file_ids=['f1'],
+    )
+
+
+def test_create_mkdirs_keeps_order_and_isolates_failures(
+    drive: BaseDrive, drive_client: FakeDriveClient, sleeps: list[float]
+) -> None:
+    drive_client.errors['/dst/b'] = ValueError('mkdir rejected')
+
+    results = asyncio.run(drive.create_mkdirs('token', [_mkdir_param(p) for p in ('/dst/a', '/dst/b', '/dst/c')]))
+
+    assert drive_client.calls == [('mkdir', '/dst/a'), ('mkdir', '/dst/b'), ('mkdir', '/dst/c')]
+    assert [path for path, _, _ in results] == ['/dst/a', '/dst/b', '/dst/c']
+    assert results[0][1].file_id == 'id:/dst/a'
+    assert results[1][1] is None
+    assert isinstance(results[1][2], ValueError)
+    assert results[2][2] is None
+    assert drive_client.write_generation == 1
+
+
+def test_create_mkdirs_empty(drive: BaseDrive, drive_client: FakeDriveClient) -> None:
+    assert asyncio.run(drive.create_mkdirs('token', [])) == []
+    assert drive_client.write_generation == 0
+
+
+def test_transfer_files_multi_is_serial_with_interval(
+    drive: BaseDrive, drive_client: FakeDriveClient, sleeps: list[float]
+) -> None:
+    drive_client.errors['/dst/broken'] = RuntimeError('transfer failed')
+    targets = ['/dst/a', '/dst/broken', '/dst/rejected', '/dst/d']
+
+    results = asyncio.run(drive.transfer_files_multi('token', [_transfer_param(t) for t in targets], interval=2))
+
+    assert drive_client.calls == [('transfer', t) for t in targets]
+    # 相邻两次请求之间各暂停一次，第一次请求前和最后一次请求后不暂停
+    assert sleeps == [2, 2, 2]
+    assert results[0] == (True, None)
+    assert results[1][0] is None
+    assert isinstance(results[1][1], RuntimeError)
+    assert results[2] == (False, None)
+    assert results[3] == (True, None)
+    assert drive_client.write_generation == 1
+
+
+def test_transfer_files_multi_retries_rate_limited_transfers(
+    drive: BaseDrive, drive_client: FakeDriveClient, sleeps: list[float]
+) -> None:
+    drive_client.errors['/dst/a'] = BaiduApiError('error_code: 31034', error_code=31034)
+
+    results = asyncio.run(drive.transfer_files_multi('token', [_transfer_param('/dst/a')]))
+
+    assert results == [(True, None)]
+    assert drive_client.calls == [('transfer', '/dst/a'), ('transfer', '/dst/a')]
+    assert len(sleeps) == 1
+
+
+@pytest.mark.parametrize(
+    'error', [requests.exceptions.ConnectionError('reset'), requests.exceptions.ReadTimeout('timeout')]
+)
+def test_transfer_files_multi_does_not_retry_transport_errors(
+    drive: BaseDrive, drive_client: FakeDriveClient, sleeps: list[float], error: Exception
+) -> None:
+    # 请求可能已送达服务端，重试会产生重复副本
+    drive_client.errors['/dst/a'] = error
+
+    results = asyncio.run(drive.transfer_files_multi('token', [_transfer_param('/dst/a')]))
+
+    assert results == [(None, error)]
+    assert drive_client.calls == [('transfer', '/dst/a')]
+    assert sleeps == []
+
+
+def test_write_gate_is_created_per_event_loop(drive_client: FakeDriveClient) -> None:
+    async def get_gates() -> tuple[asyncio.Semaphore, asyncio.Semaphore]:
+        return drive_client.write_gate, drive_client.write_gate
+
+    first, first_again = asyncio.run(get_gates())
+    second, _ = asyncio.run(get_gates())
+
+    assert first is first_again
+    assert first is not second
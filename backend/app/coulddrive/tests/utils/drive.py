@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+from typing import Any
+
+from backend.app.coulddrive.schema.file import BaseFileInfo, MkdirParam, RemoveParam, TransferParam
+from backend.app.coulddrive.service.yp_service import BaseDriveClient
+
+
+class FakeDriveClient(BaseDriveClient):
+    """记录调用顺序的内存网盘客户端，按路径中的关键字模拟失败"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls: list[tuple[str, Any]] = []
+        self.errors: dict[str, BaseException] = {}
+        self.removed_ids: list[list[str]] = []
+
+    def _maybe_raise(self, key: str) -> None:
+        error = self.errors.pop(key, None)
+        if error is not None:
+            raise error
+
+    async def mkdir(self, params: MkdirParam, **kwargs: Any) -> BaseFileInfo:
+        self.calls.append(('mkdir', params.file_path))
+        self._maybe_raise(params.file_path)
+        return BaseFileInfo(
+            file_id=f'id:{params.file_path}',
+            file_name=params.file_name,
+            file_path=params.file_path,
+            is_folder=True,
+        )
+
+    async def transfer(self, params: TransferParam, **kwargs: Any) -> bool:
+        self.calls.append(('transfer', params.target_path))
+        self._maybe_raise(params.target_path)
+        return not params.target_path.endswith('/rejected')
+
+    async def remove(self, params: RemoveParam, **kwargs: Any) -> bool:
+        self.calls.append(('remove', tuple(params.file_paths)))
+        self.removed_ids.append(list(params.file_ids or []))
+        self._maybe_raise(params.file_paths[0])
+        return not params.file_paths[0].endswith('/rejected')
+
+
+class FakeDriveManager:
+    """只提供 get_client 和分享列表的网盘管理器替身"""
+
+    def __init__(self, client: FakeDriveClient) -> None:
+        self.client = client
+        self.share_items: list[BaseFileInfo] = []
+        self.share_list_calls = 0
+
+    def get_client(self, x_token: str, drive_type: Any) -> FakeDriveClient:
+        return self.client
+
+    async def get_share_list(self, x_token: str, params: Any, **kwargs: Any) -> list[BaseFileInfo]:
+        self.share_list_calls += 1
+        return list(self.share_items)
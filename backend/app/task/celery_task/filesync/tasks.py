@@ -112,8 +112,8 @@ async def _check_and_execute_filesync_cron_tasks() -> Dict[str, Any]:
                     
                     # logger.info(f"执行配置 {config.id} ({config.remark}) 的同步任务")
                     
-                    # 执行同步任务
-                    sync_result = await file_sync_service.execute_sync_by_config_id(config.id, db)
+                    # 执行同步任务（定时同步总是重新获取源列表，避免漏掉分享中新增的文件）
+                    sync_result = await file_sync_service.execute_sync_by_config_id(config.id, db, force_refresh=True)
                     
                     if sync_result.get("success"):
                         result["executed_tasks"] += 1
@@ -179,7 +179,7 @@ async def _execute_filesync_task_by_config_id(config_id: int) -> Dict[str, Any]:
     """
     try:
         async with async_db_session() as db:
-            result = await file_sync_service.execute_sync_by_config_id(config_id, db)
+            result = await file_sync_service.execute_sync_by_config_id(config_id, db, force_refresh=True)
             
             if result.get("success"):
                 pass